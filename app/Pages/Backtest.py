@@ -19,7 +19,11 @@ def load_results():
       end_date,
       cumulative_return,
       sharpe,
-      max_drawdown
+      max_drawdown,
+      sharpe_ci_lo,
+      sharpe_ci_hi,
+      max_drawdown_ci_lo,
+      max_drawdown_ci_hi
     FROM backtest_results
     ORDER BY cumulative_return DESC
     """
@@ -44,7 +48,13 @@ st.dataframe(
             "cumulative_return": "{:.2%}",
             "sharpe": "{:.2f}",
             "max_drawdown": "{:.2%}",
-        }
+            # IC 95% (bootstrap) — vazio quando não calculado
+            "sharpe_ci_lo": "{:.2f}",
+            "sharpe_ci_hi": "{:.2f}",
+            "max_drawdown_ci_lo": "{:.2%}",
+            "max_drawdown_ci_hi": "{:.2%}",
+        },
+        na_rep="",
     ),
     use_container_width=True,
 )
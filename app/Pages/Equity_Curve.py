@@ -4,6 +4,8 @@ import pandas as pd
 import plotly.express as px
 from sqlalchemy import create_engine, text
 
+from pipelines.feature_engine import add_features
+
 st.set_page_config(page_title="Equity Curve", layout="wide")
 st.title("📈 Equity Curve (Sem vs Com Sentimento)")
 
@@ -45,12 +47,28 @@ def load_preds(ticker: str, model_name: str) -> pd.DataFrame:
     d["y_pred"] = pd.to_numeric(d["y_pred"], errors="coerce").fillna(0).astype(int)
     return d
 
+@st.cache_data(ttl=60)
+def load_rolling(ticker: str, strategies: tuple, window: int) -> pd.DataFrame:
+    # pré-calculado por `python -m ml.rolling` a partir de backtest_equity
+    q = """
+    SELECT date, strategy, sharpe, drawdown
+    FROM rolling_metrics
+    WHERE ticker = :t
+      AND strategy = ANY(:s)
+      AND window_days = :w
+    ORDER BY date;
+    """
+    d = pd.read_sql(text(q), engine, params={"t": ticker, "s": list(strategies), "w": window})
+    d["date"] = pd.to_datetime(d["date"])
+    return d
+
 
 def build_equity(prices: pd.DataFrame, preds: pd.DataFrame) -> pd.DataFrame:
     x = prices.merge(preds, on="date", how="left")
     x["y_pred"] = x["y_pred"].fillna(0).astype(int)
 
-    x["ret"] = x["close"].pct_change().fillna(0)
+    x = add_features(x, ["ret_1d"])
+    x["ret"] = x["ret_1d"].fillna(0)
     x["pos"] = x["y_pred"].clip(0, 1)          # 1 compra, 0 caixa
     x["strat_ret"] = x["pos"] * x["ret"]
     x["equity"] = (1 + x["strat_ret"]).cumprod()
@@ -94,3 +112,21 @@ else:
     c2.metric("Retorno acumulado (Sent)", f"{total_sent*100:.2f}%")
 
     st.caption("Estratégia simples: compra quando y_pred=1, senão fica em caixa.")
+
+    # Risco móvel (curvas salvas pelo treino: <modelo>_STRAT)
+    st.subheader("Sharpe e Drawdown móveis")
+    window = st.radio("Janela (pregões)", [63, 126, 252], horizontal=True)
+    roll = load_rolling(ticker, (f"{base_model}_STRAT", f"{sent_model}_STRAT"), window)
+    roll = roll[roll["date"] >= pd.to_datetime(start_date)]
+    if roll.empty:
+        st.info("Sem métricas móveis. Rode: python -m ml.rolling")
+    else:
+        r1, r2 = st.columns(2)
+        r1.plotly_chart(
+            px.line(roll, x="date", y="sharpe", color="strategy", title=f"Sharpe {window}d"),
+            use_container_width=True,
+        )
+        r2.plotly_chart(
+            px.line(roll, x="date", y="drawdown", color="strategy", title=f"Max drawdown em janelas de {window}d"),
+            use_container_width=True,
+        )
@@ -35,7 +35,11 @@ def load_results(model_name: str):
       ticker,
       cumulative_return,
       sharpe,
-      max_drawdown
+      max_drawdown,
+      sharpe_ci_lo,
+      sharpe_ci_hi,
+      max_drawdown_ci_lo,
+      max_drawdown_ci_hi
     FROM model_results
     WHERE model_name = %(m)s
     ORDER BY sharpe DESC
@@ -60,6 +64,27 @@ def load_equity(model_name: str, ticker: str):
         params={"t": ticker, "m": f"{model_name}_STRAT", "bh": f"{model_name}_BUY_HOLD"},
     )
 
+@st.cache_data(ttl=60)
+def load_rolling(model_name: str, ticker: str, window: int):
+    # pré-calculado por `python -m ml.rolling`
+    q = """
+    SELECT
+      date,
+      strategy,
+      sharpe,
+      drawdown
+    FROM rolling_metrics
+    WHERE ticker = %(t)s
+      AND strategy IN (%(m)s, %(bh)s)
+      AND window_days = %(w)s
+    ORDER BY date
+    """
+    return pd.read_sql(
+        q,
+        engine,
+        params={"t": ticker, "m": f"{model_name}_STRAT", "bh": f"{model_name}_BUY_HOLD", "w": window},
+    )
+
 @st.cache_data(ttl=60)
 def load_predictions(model_name: str, ticker: str):
     q = """
@@ -96,7 +121,13 @@ st.dataframe(
             "cumulative_return": "{:.2%}",
             "sharpe": "{:.2f}",
             "max_drawdown": "{:.2%}",
-        }
+            # IC 95% (bootstrap) — vazio quando não calculado
+            "sharpe_ci_lo": "{:.2f}",
+            "sharpe_ci_hi": "{:.2f}",
+            "max_drawdown_ci_lo": "{:.2%}",
+            "max_drawdown_ci_hi": "{:.2%}",
+        },
+        na_rep="",
     ),
     use_container_width=True,
 )
@@ -115,6 +146,23 @@ fig_eq = px.line(
 )
 st.plotly_chart(fig_eq, use_container_width=True)
 
+# Risco móvel
+st.subheader("📉 Sharpe e Drawdown móveis")
+window = st.radio("Janela (pregões)", [63, 126, 252], horizontal=True)
+df_roll = load_rolling(model, ticker, window)
+if df_roll.empty:
+    st.info("Sem métricas móveis. Rode: python -m ml.rolling")
+else:
+    c1, c2 = st.columns(2)
+    c1.plotly_chart(
+        px.line(df_roll, x="date", y="sharpe", color="strategy", title=f"Sharpe {window}d"),
+        use_container_width=True,
+    )
+    c2.plotly_chart(
+        px.line(df_roll, x="date", y="drawdown", color="strategy", title=f"Max drawdown em janelas de {window}d"),
+        use_container_width=True,
+    )
+
 # Probabilidades
 df_pred = load_predictions(model, ticker)
 st.subheader("🧠 Probabilidade prevista (prob_up)")
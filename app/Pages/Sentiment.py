@@ -3,6 +3,8 @@ import pandas as pd
 import plotly.express as px
 from sqlalchemy import create_engine
 
+from pipelines.feature_engine import add_features
+
 st.set_page_config(page_title="Sentimento de Mercado", layout="wide")
 st.title("🧠 Sentimento de Mercado (NLP)")
 
@@ -58,7 +60,7 @@ df_sent["avg_sentiment"] = pd.to_numeric(df_sent["avg_sentiment"], errors="coerc
 df_sent["n_items"] = pd.to_numeric(df_sent["n_items"], errors="coerce").fillna(0)
 
 # média móvel pra ficar visível mesmo com muito "neutral"
-df_sent["sentiment_3d"] = df_sent["avg_sentiment"].rolling(3).mean()
+df_sent = add_features(df_sent, ["sentiment_3d"])
 
 fig_scatter = px.scatter(
     df_sent,
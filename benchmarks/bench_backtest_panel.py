@@ -0,0 +1,98 @@
+"""
+Benchmark: backtest MA20 > MA50 por ticker (loop) vs painel vetorizado.
+
+    python -m benchmarks.bench_backtest_panel --tickers 500 --years 10
+    python -m benchmarks.bench_backtest_panel --db     # inclui as consultas no Postgres
+    python -m benchmarks.bench_backtest_panel --n-boot 2000   # mede também os ICs (opcionais)
+
+Os dois caminhos rodam com os padrões (sem IC, como o CLI). Confere que as
+linhas de backtest_results saem idênticas nos dois caminhos.
+"""
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine
+
+from benchmarks.bench_feature_engine import synthetic_bronze
+from ml.backtest import ENGINE_URL, load_data, load_panel, run_backtest, run_backtest_panel
+from pipelines.feature_engine import compute_features
+
+METRICS = ["cumulative_return", "sharpe", "max_drawdown"]
+
+
+def run_loop(frames: dict) -> pd.DataFrame:
+    rows = [
+        {"ticker": t, **run_backtest(g.reset_index(drop=True))}
+        for t, g in frames.items()
+        if len(g) >= 60
+    ]
+    return pd.DataFrame(rows)
+
+
+def check_identical(ref: pd.DataFrame, fast: pd.DataFrame):
+    ref = ref.sort_values("ticker").reset_index(drop=True)
+    fast = fast.sort_values("ticker").reset_index(drop=True)
+    assert ref["ticker"].tolist() == fast["ticker"].tolist()
+    for c in ["start_date", "end_date"] + METRICS:
+        np.testing.assert_array_equal(ref[c].to_numpy(), fast[c].to_numpy(), err_msg=c)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tickers", type=int, default=500)
+    parser.add_argument("--years", type=int, default=10)
+    parser.add_argument("--db", action="store_true", help="mede também a leitura do Postgres (1 consulta vs N)")
+    parser.add_argument("--n-boot", type=int, default=0, help="mede também o painel com ICs bootstrap")
+    args = parser.parse_args()
+
+    if args.db:
+        engine = create_engine(ENGINE_URL)
+        tickers = pd.read_sql("SELECT DISTINCT ticker FROM prices_daily ORDER BY ticker", engine)["ticker"].tolist()
+
+        t0 = time.perf_counter()
+        frames = {t: load_data(engine, t) for t in tickers}
+        t_load_loop = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        df = load_panel(engine)
+        t_load_panel = time.perf_counter() - t0
+    else:
+        bronze = synthetic_bronze(args.tickers, args.years * 252)
+        df = compute_features(bronze, ["ma_20", "ma_50"])[["ticker", "date", "close", "ma_20", "ma_50"]]
+        frames = {t: g for t, g in df.groupby("ticker")}
+        t_load_loop = t_load_panel = 0.0
+
+    print(f"Painel: {len(frames)} tickers ({len(df)} linhas)")
+
+    t0 = time.perf_counter()
+    ref = run_loop(frames)
+    t_loop = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    fast = run_backtest_panel(df)
+    t_panel = time.perf_counter() - t0
+
+    check_identical(ref, fast)
+
+    if args.db:
+        print(f"Leitura (N consultas) : {t_load_loop:.3f}s")
+        print(f"Leitura (1 consulta)  : {t_load_panel:.3f}s")
+    print(f"Backtest loop         : {t_loop:.3f}s")
+    print(f"Backtest painel       : {t_panel:.3f}s")
+    print(
+        f"Speedup               : {(t_load_loop + t_loop) / (t_load_panel + t_panel):.1f}x "
+        f"(linhas idênticas)"
+    )
+
+    if args.n_boot:
+        t0 = time.perf_counter()
+        with_ci = run_backtest_panel(df, n_boot=args.n_boot)
+        t_ci = time.perf_counter() - t0
+        check_identical(fast, with_ci)
+        label = f"Painel + IC ({args.n_boot})"
+        print(f"{label:<22}: {t_ci:.3f}s ({t_ci / len(with_ci) * 1000:.0f} ms por ticker)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark: tabela de métricas de um painel tickers × dias (kernel 2D com
+máscara) vs uma passada pandas por ticker e por métrica.
+
+    python -m benchmarks.bench_metrics --tickers 500 --years 10
+
+Confere que:
+- cumulative_return / sharpe_ratio / max_drawdown (agora finos sobre o kernel)
+  batem bit a bit com as versões pandas originais;
+- metric_table num painel com séries de tamanhos diferentes e NaN bate com a
+  referência pandas série a série em todas as colunas.
+"""
+import argparse
+import time
+import numpy as np
+import pandas as pd
+
+from ml.metrics import METRIC_COLS, cumulative_return, max_drawdown, metric_table, sharpe_ratio
+
+
+def reference(r: pd.Series, periods_per_year: int = 252) -> dict:
+    # definições pandas, uma passada por métrica
+    r = r.dropna()
+    equity = (1 + r).cumprod()
+    peak = equity.cummax()
+    under = equity < peak
+    runs = under.groupby((~under).cumsum()).sum()
+    dd = float((equity / peak - 1).min())
+    n = len(r)
+    growth = float((1 + r).prod())
+    down = np.sqrt((r.clip(upper=0) ** 2).sum() / n)
+    on = r != 0
+    return {
+        "n_days": n,
+        "cumulative_return": growth - 1,
+        "sharpe": 0.0 if r.std() == 0 else float(r.mean() / r.std() * np.sqrt(periods_per_year)),
+        "sortino": float(r.mean() / down * np.sqrt(periods_per_year)) if down > 0 else np.nan,
+        "calmar": (growth ** (periods_per_year / n) - 1) / -dd if dd < 0 else np.nan,
+        "max_drawdown": dd,
+        "max_drawdown_days": int(runs.max()) if len(runs) else 0,
+        "hit_rate": float((r[on] > 0).mean()) if on.any() else np.nan,
+        "exposure": float(on.mean()),
+    }
+
+
+def original(r: pd.Series) -> tuple:
+    # ml.metrics antes do kernel
+    rr = r.dropna()
+    sharpe = 0.0 if rr.std() == 0 else float((rr.mean() / rr.std()) * np.sqrt(252))
+    equity = (1 + r).cumprod()
+    return (float((1 + rr).prod() - 1), sharpe, float((equity / equity.cummax() - 1).min()))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tickers", type=int, default=500)
+    parser.add_argument("--years", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    n_d = args.years * 252
+    # retornos de estratégia (fora do mercado em ~40% dos dias), séries de tamanhos diferentes
+    ret = rng.normal(0.0004, 0.02, (args.tickers, n_d)) * (rng.random((args.tickers, n_d)) < 0.6)
+    lengths = rng.integers(n_d // 4, n_d + 1, args.tickers)
+    valid = np.arange(n_d) < lengths[:, None]
+    ret[rng.random(ret.shape) < 0.001] = np.nan
+    series = [pd.Series(ret[i, :lengths[i]]) for i in range(args.tickers)]
+
+    # wrappers × versões originais (bit a bit)
+    for s in series[:50]:
+        assert (cumulative_return(s), sharpe_ratio(s), max_drawdown((1 + s).cumprod())) == original(s)
+
+    t0 = time.perf_counter()
+    ref = pd.DataFrame([reference(s) for s in series])
+    t_loop = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    table = metric_table(ret, valid)
+    t_kernel = time.perf_counter() - t0
+
+    for c in METRIC_COLS:
+        np.testing.assert_allclose(table[c], ref[c].to_numpy(dtype=float), rtol=1e-10, atol=1e-12, err_msg=c)
+
+    print(f"Painel: {args.tickers} tickers × até {n_d} dias | {len(METRIC_COLS)} métricas")
+    print(f"pandas por ticker : {t_loop:.3f}s")
+    print(f"kernel 2D         : {t_kernel:.3f}s")
+    print(f"Speedup           : {t_loop / t_kernel:.0f}x (wrappers idênticos; tabela bate com a referência)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark: acrescentar 1 dia às métricas (acumuladores online) vs recalcular
+a série inteira com as funções em lote de ml.metrics.
+
+    python -m benchmarks.bench_online_metrics --years 10
+
+Também confere que os acumuladores (dia a dia, em blocos e após salvar/
+restaurar o estado) batem com cumulative_return / sharpe_ratio / max_drawdown.
+"""
+import argparse
+import time
+import numpy as np
+import pandas as pd
+
+from ml.metrics import OnlineMetrics, cumulative_return, max_drawdown, sharpe_ratio
+
+
+def batch(returns: pd.Series) -> tuple[float, float, float]:
+    return (
+        cumulative_return(returns),
+        sharpe_ratio(returns),
+        max_drawdown((1 + returns).cumprod()),
+    )
+
+
+def online(acc: OnlineMetrics) -> tuple[float, float, float]:
+    return acc.cumulative_return, acc.sharpe, acc.max_drawdown
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--years", type=int, default=10)
+    parser.add_argument("--appends", type=int, default=250, help="dias novos acrescentados um a um")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    n = args.years * 252
+    # estratégia fica fora do mercado em parte dos dias (retorno 0), como no backtest
+    r = pd.Series(rng.normal(0.0004, 0.02, n + args.appends) * (rng.random(n + args.appends) < 0.6))
+
+    one = OnlineMetrics()
+    for x in r:
+        one.update(x)
+    blocks = OnlineMetrics()
+    for i in range(0, len(r), 97):
+        blocks.update_many(r.iloc[i:i + 97])
+    restored = OnlineMetrics.from_state(blocks.to_state())
+
+    expected = batch(r)
+    for name, acc in (("dia a dia", one), ("em blocos", blocks), ("estado restaurado", restored)):
+        np.testing.assert_allclose(online(acc), expected, rtol=1e-10, atol=1e-12, err_msg=name)
+
+    # cenário diário: histórico de `years` anos já acumulado, chegam dias novos
+    hist, new = r.iloc[:n], r.iloc[n:]
+
+    t0 = time.perf_counter()
+    for k in range(1, len(new) + 1):
+        batch(r.iloc[:n + k])
+    t_batch = (time.perf_counter() - t0) / len(new)
+
+    acc = OnlineMetrics()
+    acc.update_many(hist)
+    t0 = time.perf_counter()
+    for x in new:
+        acc.update(x)
+        online(acc)
+    t_online = (time.perf_counter() - t0) / len(new)
+
+    np.testing.assert_allclose(online(acc), expected, rtol=1e-10, atol=1e-12)
+
+    print(f"Série: {n} dias + {len(new)} dias novos (métricas idênticas até 1e-10)")
+    print(f"Recalcular tudo por dia : {t_batch * 1e6:9.1f} µs")
+    print(f"Acumulador online por dia: {t_online * 1e6:9.1f} µs")
+    print(f"Speedup                 : {t_batch / t_online:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
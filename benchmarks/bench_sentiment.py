@@ -0,0 +1,65 @@
+"""
+Benchmark: headlines/s do scoring de sentimento na CPU (1 a 1 vs em lote).
+
+    python -m benchmarks.bench_sentiment --n 512 --threads 4
+"""
+import argparse
+import random
+import time
+import numpy as np
+
+from pipelines import sentiment_news as sn
+
+WORDS = (
+    "Petrobras Vale Itaú lucro prejuízo dividendos alta queda ações Ibovespa "
+    "resultado trimestre recorde investidores mercado juros inflação B3 balanço "
+    "rebaixa recomendação compra venda analistas guidance produção minério petróleo"
+).split()
+
+
+def synthetic_headlines(n: int, seed: int = 7) -> list[str]:
+    rng = random.Random(seed)
+    return [" ".join(rng.choices(WORDS, k=rng.randint(6, 40))) for _ in range(n)]
+
+
+def score_one_by_one(pipe, texts):
+    # caminho antigo: uma chamada do pipeline por título
+    out = []
+    for t in texts:
+        res = pipe(t[:512], top_k=None)
+        # [[{label, score}, ...]] ou [{label, score}, ...]: usa todas as classes
+        first = res[0] if res and isinstance(res[0], list) else res
+        pos, neg, _ = sn.scores_from_pipeline_output(first)
+        out.append(pos - neg)
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=512)
+    parser.add_argument("--threads", type=int)
+    parser.add_argument("--batch-sizes", default="8,16,32,64")
+    args = parser.parse_args()
+
+    sn.configure_backend("torch", args.threads)
+    threads = sn.get_backend().threads
+    pipe = sn.make_sentiment_pipeline()
+    texts = synthetic_headlines(args.n)
+    sn.score_texts(texts[:8])  # aquecimento
+
+    t0 = time.perf_counter()
+    ref = np.array(score_one_by_one(pipe, texts))
+    base = args.n / (time.perf_counter() - t0)
+    print(f"threads={threads} | n={args.n}")
+    print(f"1 a 1        : {base:8.1f} headlines/s")
+
+    for bs in [int(b) for b in args.batch_sizes.split(",")]:
+        t0 = time.perf_counter()
+        got = np.array(sn.score_texts(texts, batch_size=bs))
+        rate = args.n / (time.perf_counter() - t0)
+        diff = np.abs(got - ref).max()
+        print(f"lote {bs:<7} : {rate:8.1f} headlines/s ({rate / base:.1f}x) | max|Δ|={diff:.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark dos backends de sentimento na CPU: carga, latência, throughput,
+memória (pico de RSS) e concordância com o fp32.
+
+    python -m benchmarks.bench_sentiment_backends --n 512 --threads 4
+
+Cada backend roda num processo novo para o pico de memória não se misturar.
+"""
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import multiprocessing as mp
+import resource
+import time
+import numpy as np
+
+from benchmarks.bench_sentiment import synthetic_headlines
+from pipelines.sentiment_backends import BACKENDS
+
+
+def run_backend(name: str, n: int, threads: int | None, batch_size: int) -> dict:
+    from pipelines import sentiment_news as sn
+
+    texts = synthetic_headlines(n)
+    rss0 = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    t0 = time.perf_counter()
+    sn.configure_backend(name, threads)
+    sn.get_backend()
+    load_s = time.perf_counter() - t0
+
+    sn.score_texts(texts[:batch_size], batch_size=batch_size)  # aquecimento
+
+    t0 = time.perf_counter()
+    scores = sn.score_texts(texts, batch_size=batch_size)
+    elapsed = time.perf_counter() - t0
+
+    return {
+        "backend": name,
+        "load_s": load_s,
+        "headlines_s": n / elapsed,
+        "ms_per_batch": 1000 * elapsed / -(-n // batch_size),
+        "rss_mb": (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss0) / 1024,
+        "scores": np.asarray(scores),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=512)
+    parser.add_argument("--threads", type=int)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--backends", default=",".join(BACKENDS))
+    args = parser.parse_args()
+
+    results = []
+    for name in args.backends.split(","):
+        with ProcessPoolExecutor(max_workers=1, mp_context=mp.get_context("spawn")) as pool:
+            results.append(pool.submit(run_backend, name, args.n, args.threads, args.batch_size).result())
+
+    ref = next((r["scores"] for r in results if r["backend"] == "torch"), None)
+
+    print(f"n={args.n} | batch={args.batch_size}")
+    print(f"{'backend':<11} {'carga(s)':>8} {'hl/s':>8} {'ms/lote':>8} {'RSS(MB)':>8} {'max|Δ|':>8} {'média|Δ|':>9} {'sinal=':>7}")
+    for r in results:
+        if ref is None:
+            dmax = dmean = agree = float("nan")
+        else:
+            d = np.abs(r["scores"] - ref)
+            dmax, dmean = d.max(), d.mean()
+            agree = np.mean(np.sign(r["scores"]) == np.sign(ref))
+        print(
+            f"{r['backend']:<11} {r['load_s']:8.2f} {r['headlines_s']:8.1f} {r['ms_per_batch']:8.1f} "
+            f"{r['rss_mb']:8.0f} {dmax:8.4f} {dmean:9.4f} {agree:7.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark: headlines/s do scoring de sentimento em N processos (shards).
+
+    python -m benchmarks.bench_sentiment_workers --n 2048 --workers 1,2,4,8
+
+Cada configuração usa threads = CPUs / workers (ou --threads fixo por processo).
+O tempo de carga do modelo nos workers fica fora da medição (aquecimento).
+"""
+import argparse
+import os
+import time
+import numpy as np
+
+from benchmarks.bench_sentiment import synthetic_headlines
+from pipelines import sentiment_news as sn
+from pipelines.sentiment_backends import BACKENDS, default_threads
+
+
+def run(texts, workers: int, threads: int | None, batch_size: int) -> dict:
+    threads = threads or max(1, default_threads() // workers)
+
+    t0 = time.perf_counter()
+    with sn.make_score_pool(workers, threads) as pool:
+        # um shard pequeno por worker: sobe todos os processos e carrega o modelo
+        sn.score_texts_sharded(texts[:workers * batch_size], pool, batch_size, shard_size=batch_size)
+        load_s = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        scores = sn.score_texts_sharded(texts, pool, batch_size)
+        elapsed = time.perf_counter() - t0
+
+    return {
+        "workers": workers,
+        "threads": threads,
+        "load_s": load_s,
+        "headlines_s": len(texts) / elapsed,
+        "scores": np.asarray(scores),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=2048)
+    parser.add_argument("--workers", default="1,2,4")
+    parser.add_argument("--threads", type=int, help="threads por processo (padrão: CPUs / workers)")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--backend", choices=BACKENDS, default=sn.BACKEND)
+    args = parser.parse_args()
+
+    sn.configure_backend(args.backend)
+    texts = synthetic_headlines(args.n)
+
+    results = [run(texts, int(w), args.threads, args.batch_size) for w in args.workers.split(",")]
+    base = results[0]
+
+    print(f"n={args.n} | batch={args.batch_size} | backend={args.backend} | CPUs={os.cpu_count()}")
+    print(f"{'workers':>7} {'threads':>7} {'carga(s)':>8} {'hl/s':>8} {'speedup':>8} {'max|Δ|':>8}")
+    for r in results:
+        print(
+            f"{r['workers']:7d} {r['threads']:7d} {r['load_s']:8.2f} {r['headlines_s']:8.1f} "
+            f"{r['headlines_s'] / base['headlines_s']:7.2f}x {np.abs(r['scores'] - base['scores']).max():8.2e}"
+        )
+
+
+if __name__ == "__main__":
+    main()
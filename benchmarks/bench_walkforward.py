@@ -0,0 +1,79 @@
+"""
+Benchmark: walk-forward do modelo (retreino a cada K dias) — folds em
+sequência, do zero vs warm start, e num pool de processos.
+
+    python -m benchmarks.bench_walkforward --tickers 20 --years 8 --workers 1,2,4
+
+Confere que o warm start chega nas mesmas probabilidades do treino do zero
+(mesmo problema convexo, até a tolerância do solver) e que o pool devolve
+o mesmo que o caminho serial.
+"""
+import argparse
+import os
+import time
+import numpy as np
+
+from benchmarks.bench_feature_engine import synthetic_bronze
+from ml.model_train_backtest import WF_STEP, walk_forward
+from pipelines.feature_engine import add_features, compute_features
+
+
+def synthetic_frames(n_tickers: int, n_days: int) -> dict:
+    # mesmo formato de load_dataset (gold_features + rótulo y_up_5d)
+    df = compute_features(synthetic_bronze(n_tickers, n_days), ["ma_20", "ma_50", "volatility_20"])
+    rng = np.random.default_rng(1)
+    df["avg_sentiment"] = np.where(rng.random(len(df)) < 0.3, rng.normal(0, 0.5, len(df)), np.nan)
+
+    frames = {}
+    for t, g in df.groupby("ticker"):
+        g = add_features(g.reset_index(drop=True), ["sentiment_3d", "ret_1d", "ret_5d_fwd"])
+        g["avg_sentiment"] = g["avg_sentiment"].fillna(0)
+        g["y_up_5d"] = (g["ret_5d_fwd"] > 0).astype(int)
+        frames[t] = g.dropna(subset=["ret_1d"])
+    return frames
+
+
+def run(frames: dict, **kwargs) -> tuple[dict, float]:
+    t0 = time.perf_counter()
+    out = walk_forward(frames, **kwargs)
+    return out, time.perf_counter() - t0
+
+
+def summary(out: dict) -> tuple[int, float]:
+    stats = [f for _, _, st in out.values() for f in st]
+    return len(stats), float(np.mean([f["n_iter"] for f in stats]))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tickers", type=int, default=20)
+    parser.add_argument("--years", type=int, default=8)
+    parser.add_argument("--step", type=int, default=WF_STEP)
+    parser.add_argument("--window", choices=["expanding", "sliding"], default="expanding")
+    parser.add_argument("--workers", default=f"1,{os.cpu_count() or 1}")
+    args = parser.parse_args()
+
+    frames = synthetic_frames(args.tickers, args.years * 252)
+    common = {"step": args.step, "window": args.window}
+
+    cold, t_cold = run(frames, warm_start=False, **common)
+    warm, t_warm = run(frames, warm_start=True, **common)
+
+    diff = max(np.abs(warm[t][1] - cold[t][1]).max() for t in cold)
+    assert diff < 1e-2, diff
+
+    n_folds, it_cold = summary(cold)
+    _, it_warm = summary(warm)
+    print(f"{len(frames)} tickers × {args.years * 252} dias | {n_folds} folds ({args.window}, K={args.step})")
+    print(f"do zero     : {t_cold:.2f}s | iter/fold={it_cold:.0f}")
+    print(f"warm start  : {t_warm:.2f}s | iter/fold={it_warm:.0f} | max|Δ prob|={diff:.1e}")
+
+    for w in (int(x) for x in args.workers.split(",")):
+        par, t_par = run(frames, warm_start=True, workers=w, **common)
+        for t in warm:
+            np.testing.assert_allclose(par[t][1], warm[t][1], rtol=0, atol=1e-12)
+        print(f"workers={w:<3} : {t_par:.2f}s ({t_warm / t_par:.1f}x vs serial)")
+
+
+if __name__ == "__main__":
+    main()
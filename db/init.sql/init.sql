@@ -12,6 +12,7 @@ CREATE TABLE IF NOT EXISTS prices_daily (
 CREATE TABLE IF NOT EXISTS features_daily (
     ticker TEXT,
     date DATE,
+    rsi_14 NUMERIC,
     ma_20 NUMERIC,
     ma_50 NUMERIC,
     volatility_20 NUMERIC,
@@ -25,3 +26,152 @@ CREATE TABLE IF NOT EXISTS risk_scores (
     risk_score NUMERIC,
     PRIMARY KEY (ticker, date)
 );
+
+CREATE TABLE IF NOT EXISTS sentiment_daily (
+    ticker TEXT,
+    date DATE,
+    source TEXT,
+    avg_sentiment NUMERIC,
+    n_items INTEGER,
+    sample_titles TEXT,
+    PRIMARY KEY (ticker, date, source)
+);
+
+-- instalações antigas: sentiment_daily criada pelo to_sql, sem chave primária
+-- (o upsert de sentiment_news precisa dela); remove duplicatas e cria a PK
+DO $$
+BEGIN
+    IF to_regclass('sentiment_daily') IS NOT NULL AND NOT EXISTS (
+        SELECT 1 FROM pg_constraint
+        WHERE conrelid = 'sentiment_daily'::regclass AND contype = 'p'
+    ) THEN
+        DELETE FROM sentiment_daily
+        WHERE ticker IS NULL OR date IS NULL OR source IS NULL;
+
+        -- fica a linha gravada por último de cada (ticker, date, source)
+        DELETE FROM sentiment_daily a
+        USING sentiment_daily b
+        WHERE a.ticker = b.ticker AND a.date = b.date AND a.source = b.source
+          AND a.ctid < b.ctid;
+
+        ALTER TABLE sentiment_daily ADD PRIMARY KEY (ticker, date, source);
+    END IF;
+END $$;
+
+CREATE TABLE IF NOT EXISTS backtest_sweep (
+    ticker TEXT,
+    fast INTEGER,
+    slow INTEGER,
+    start_date DATE,
+    end_date DATE,
+    cumulative_return NUMERIC,
+    sharpe NUMERIC,
+    max_drawdown NUMERIC,
+    PRIMARY KEY (ticker, fast, slow)
+);
+
+CREATE TABLE IF NOT EXISTS backtest_state (
+    strategy TEXT,
+    ticker TEXT,
+    start_date DATE,
+    last_date DATE,
+    n INTEGER,
+    mean DOUBLE PRECISION,
+    m2 DOUBLE PRECISION,
+    growth DOUBLE PRECISION,
+    peak DOUBLE PRECISION,
+    max_dd DOUBLE PRECISION,
+    PRIMARY KEY (strategy, ticker)
+);
+
+CREATE TABLE IF NOT EXISTS portfolio_results (
+    strategy TEXT PRIMARY KEY,
+    start_date DATE,
+    end_date DATE,
+    cumulative_return NUMERIC,
+    sharpe NUMERIC,
+    max_drawdown NUMERIC,
+    annual_turnover NUMERIC,
+    avg_names NUMERIC,
+    avg_gross NUMERIC
+);
+
+CREATE TABLE IF NOT EXISTS backtest_exits (
+    ticker TEXT,
+    stop_loss NUMERIC,
+    take_profit NUMERIC,
+    trailing_stop NUMERIC,
+    start_date DATE,
+    end_date DATE,
+    cumulative_return NUMERIC,
+    sharpe NUMERIC,
+    max_drawdown NUMERIC,
+    n_exits INTEGER,
+    PRIMARY KEY (ticker, stop_loss, take_profit, trailing_stop)
+);
+
+CREATE TABLE IF NOT EXISTS backtest_results (
+    id SERIAL PRIMARY KEY,
+    strategy TEXT,
+    ticker TEXT,
+    start_date DATE,
+    end_date DATE,
+    cumulative_return NUMERIC,
+    sharpe NUMERIC,
+    max_drawdown NUMERIC,
+    created_at TIMESTAMP DEFAULT now(),
+    sharpe_ci_lo NUMERIC,
+    sharpe_ci_hi NUMERIC,
+    max_drawdown_ci_lo NUMERIC,
+    max_drawdown_ci_hi NUMERIC
+);
+
+CREATE TABLE IF NOT EXISTS model_results (
+    id SERIAL PRIMARY KEY,
+    model_name TEXT,
+    ticker TEXT,
+    start_date DATE,
+    end_date DATE,
+    cumulative_return NUMERIC,
+    sharpe NUMERIC,
+    max_drawdown NUMERIC,
+    created_at TIMESTAMP DEFAULT now(),
+    sharpe_ci_lo NUMERIC,
+    sharpe_ci_hi NUMERIC,
+    max_drawdown_ci_lo NUMERIC,
+    max_drawdown_ci_hi NUMERIC
+);
+
+-- ICs bootstrap (95%) de Sharpe e max drawdown (ml/resampling.py) em tabelas
+-- antigas; o ALTER só roda se faltar coluna (evita o lock exclusivo a cada execução)
+DO $$
+DECLARE
+    t TEXT;
+BEGIN
+    FOREACH t IN ARRAY ARRAY['backtest_results', 'model_results'] LOOP
+        IF (
+            SELECT count(*) FROM information_schema.columns
+            WHERE table_schema = current_schema() AND table_name = t
+              AND column_name IN ('sharpe_ci_lo', 'sharpe_ci_hi', 'max_drawdown_ci_lo', 'max_drawdown_ci_hi')
+        ) < 4 THEN
+            EXECUTE format(
+                'ALTER TABLE %I
+                    ADD COLUMN IF NOT EXISTS sharpe_ci_lo NUMERIC,
+                    ADD COLUMN IF NOT EXISTS sharpe_ci_hi NUMERIC,
+                    ADD COLUMN IF NOT EXISTS max_drawdown_ci_lo NUMERIC,
+                    ADD COLUMN IF NOT EXISTS max_drawdown_ci_hi NUMERIC',
+                t
+            );
+        END IF;
+    END LOOP;
+END $$;
+
+CREATE TABLE IF NOT EXISTS rolling_metrics (
+    strategy TEXT,
+    ticker TEXT,
+    date DATE,
+    window_days INTEGER,
+    sharpe NUMERIC,
+    drawdown NUMERIC,
+    PRIMARY KEY (strategy, ticker, window_days, date)
+);
@@ -1,21 +1,207 @@
 import numpy as np
 import pandas as pd
 
+METRIC_COLS = [
+    "n_days", "cumulative_return", "sharpe", "sortino", "calmar",
+    "max_drawdown", "max_drawdown_days", "hit_rate", "exposure",
+]
+
+
+def drawdown_table(equity: np.ndarray, mask: np.ndarray | None = None) -> dict:
+    """
+    Max drawdown e sua duração (maior sequência de dias abaixo do pico) por
+    linha de `equity` (séries × dias). Células fora de `mask` (ou NaN) são
+    ignoradas, como cummax/min do pandas: não mexem no pico nem quebram a sequência.
+    """
+    equity = np.atleast_2d(np.asarray(equity, dtype=float))
+    valid = ~np.isnan(equity) if mask is None else np.atleast_2d(mask) & ~np.isnan(equity)
+
+    peak = np.maximum.accumulate(np.where(valid, equity, -np.inf), axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        drawdown = equity / peak - 1
+    max_dd = np.where(valid, drawdown, np.inf).min(axis=-1, initial=np.inf)
+    max_dd = np.where(valid.any(axis=-1), max_dd, np.nan)
+
+    # sequência abaixo do pico: contador de dias submersos menos o valor no último dia no pico
+    under = valid & (drawdown < 0)
+    count = np.cumsum(under, axis=-1)
+    reset = np.maximum.accumulate(np.where(valid & ~under, count, 0), axis=-1)
+    duration = (count - reset).max(axis=-1, initial=0)
+    return {"max_drawdown": max_dd, "max_drawdown_days": duration}
+
+
+def metric_table(
+    returns: np.ndarray,
+    mask: np.ndarray | None = None,
+    active: np.ndarray | None = None,
+    rf_daily: float = 0.0,
+    periods_per_year: int = 252,
+) -> dict:
+    """
+    Tabela de métricas para uma matriz de retornos (séries × dias) de uma vez,
+    sem loop por série. `mask` marca os dias válidos de cada linha (além dos
+    NaN); dias fora dela contam como ausentes, como no dropna() das funções
+    abaixo. `active` marca os dias com posição (padrão: retorno ≠ 0).
+
+    Retorna um array por coluna de METRIC_COLS:
+    - sharpe / sortino: anualizados; sortino usa o desvio só dos retornos < 0
+      (alvo 0, sobre todos os dias) e é NaN sem dias negativos
+    - calmar: retorno anualizado / |max drawdown| (NaN sem drawdown)
+    - max_drawdown_days: maior sequência de dias abaixo do pico
+    - hit_rate: dias positivos / dias com posição; exposure: dias com posição / dias
+    Médias e variâncias seguem o Series.mean/std do pandas (duas passadas,
+    ddof=1), então linhas sem dias mascarados batem bit a bit com ele.
+    """
+    r = np.atleast_2d(np.asarray(returns, dtype=float))
+    valid = ~np.isnan(r) if mask is None else np.atleast_2d(mask) & ~np.isnan(r)
+    n = valid.sum(axis=-1)
+
+    # uma cópia com 0 fora da máscara serve para todas as somas
+    x = np.where(valid, r - rf_daily, 0.0)
+    growth = np.where(valid, 1 + r, 1.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = x.sum(axis=-1) / n
+        sq = (mean[..., None] - x) ** 2
+        sq[~valid] = 0.0
+        # < 2 dias: desvio indefinido (NaN), como Series.std()
+        std = np.where(n > 1, np.sqrt(sq.sum(axis=-1) / (n - 1)), np.nan)
+        sharpe = np.where(std == 0, 0.0, (mean / std) * np.sqrt(periods_per_year))
+
+        downside = np.sqrt((np.minimum(x, 0.0) ** 2).sum(axis=-1) / n)
+        sortino = np.where(downside > 0, mean / downside * np.sqrt(periods_per_year), np.nan)
+
+    cum_ret = np.prod(growth, axis=-1) - 1
+    dd = drawdown_table(np.cumprod(growth, axis=-1), valid)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        annual = (1 + cum_ret) ** (periods_per_year / n) - 1
+        calmar = np.where(dd["max_drawdown"] < 0, annual / -dd["max_drawdown"], np.nan)
+
+        on = valid & (r != 0) if active is None else valid & np.atleast_2d(active)
+        n_on = on.sum(axis=-1)
+        hit_rate = np.where(n_on > 0, (on & (r > 0)).sum(axis=-1) / n_on, np.nan)
+        exposure = n_on / n
+
+    return {
+        "n_days": n,
+        "cumulative_return": cum_ret,
+        "sharpe": sharpe,
+        "sortino": sortino,
+        "calmar": calmar,
+        "max_drawdown": dd["max_drawdown"],
+        "max_drawdown_days": dd["max_drawdown_days"],
+        "hit_rate": hit_rate,
+        "exposure": exposure,
+    }
+
+
+# versões de uma série (pandas), finas sobre os kernels acima
+
 def cumulative_return(returns: pd.Series) -> float:
     returns = returns.dropna()
-    return float((1 + returns).prod() - 1)
+    return float(metric_table(returns.to_numpy(dtype=float))["cumulative_return"][0])
 
 def max_drawdown(equity: pd.Series) -> float:
-    peak = equity.cummax()
-    drawdown = equity / peak - 1
-    return float(drawdown.min())
+    return float(drawdown_table(equity.to_numpy(dtype=float))["max_drawdown"][0])
 
 def sharpe_ratio(
     returns: pd.Series,
     rf_daily: float = 0.0,
     periods_per_year: int = 252
 ) -> float:
-    r = returns.dropna() - rf_daily
-    if r.std() == 0:
-        return 0.0
-    return float((r.mean() / r.std()) * np.sqrt(periods_per_year))
\ No newline at end of file
+    r = returns.dropna()
+    return float(metric_table(r.to_numpy(dtype=float), rf_daily=rf_daily, periods_per_year=periods_per_year)["sharpe"][0])
+
+
+class OnlineMetrics:
+    """
+    Acumuladores das métricas acima, atualizados um retorno por vez (O(1)):
+    média/variância de Welford (Sharpe), produto corrente (retorno acumulado)
+    e pico/drawdown correntes. O estado cabe numa linha (to_state/from_state),
+    então dá para persistir por (estratégia, ticker) e só somar os dias novos.
+    Os resultados batem com as funções em lote até a tolerância de ponto flutuante.
+    """
+
+    FIELDS = ("n", "mean", "m2", "growth", "peak", "max_dd")
+
+    def __init__(self, rf_daily: float = 0.0, periods_per_year: int = 252):
+        self.rf_daily = rf_daily
+        self.periods_per_year = periods_per_year
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.growth = 1.0
+        self.peak = np.nan
+        self.max_dd = 0.0
+
+    def update(self, r: float):
+        if np.isnan(r):
+            return
+        # Welford (sobre o excesso de retorno, como sharpe_ratio)
+        x = r - self.rf_daily
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (x - self.mean)
+
+        # equity = produto corrente; o pico começa no 1º valor, como cummax
+        self.growth *= 1 + r
+        if not self.peak >= self.growth:
+            self.peak = self.growth
+        self.max_dd = min(self.max_dd, self.growth / self.peak - 1)
+
+    def update_many(self, returns):
+        """
+        Soma um bloco de retornos de uma vez (vetorizado): combina média/M2
+        do bloco com as do estado (Chan et al.) e continua produto e pico.
+        """
+        r = np.asarray(returns, dtype=float)
+        r = r[~np.isnan(r)]
+        k = len(r)
+        if k == 0:
+            return
+
+        x = r - self.rf_daily
+        mean_b = x.mean()
+        m2_b = ((x - mean_b) ** 2).sum()
+        n = self.n + k
+        delta = mean_b - self.mean
+        self.mean += delta * k / n
+        self.m2 += m2_b + delta ** 2 * self.n * k / n
+        self.n = n
+
+        equity = self.growth * np.cumprod(1 + r)
+        peak = np.maximum.accumulate(equity)
+        if self.peak >= peak[0]:
+            peak = np.maximum(peak, self.peak)
+        self.max_dd = min(self.max_dd, float((equity / peak - 1).min()))
+        self.growth = float(equity[-1])
+        self.peak = float(peak[-1])
+
+    @property
+    def cumulative_return(self) -> float:
+        return float(self.growth - 1)
+
+    @property
+    def max_drawdown(self) -> float:
+        return float(self.max_dd)
+
+    @property
+    def sharpe(self) -> float:
+        if self.n < 2:
+            return float("nan")  # como Series.std() com 1 ponto
+        std = np.sqrt(self.m2 / (self.n - 1))
+        if std == 0:
+            return 0.0
+        return float((self.mean / std) * np.sqrt(self.periods_per_year))
+
+    def to_state(self) -> dict:
+        return {f: getattr(self, f) for f in self.FIELDS}
+
+    @classmethod
+    def from_state(cls, state: dict, **kwargs) -> "OnlineMetrics":
+        acc = cls(**kwargs)
+        for f in cls.FIELDS:
+            setattr(acc, f, state[f])
+        acc.n = int(acc.n)
+        return acc
@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+
+N_BOOT = 2000
+ALPHA = 0.05
+SEED = 42
+
+CI_COLS = ["sharpe_ci_lo", "sharpe_ci_hi", "max_drawdown_ci_lo", "max_drawdown_ci_hi"]
+
+
+def default_block(n: int) -> int:
+    # regra usual para bootstrap em blocos: tamanho médio ~ n^(1/3)
+    return max(1, int(round(n ** (1 / 3))))
+
+
+def stationary_indices(n: int, n_boot: int, mean_block: float, rng: np.random.Generator) -> np.ndarray:
+    """
+    Índices (n_boot × n) do bootstrap estacionário (Politis & Romano): blocos
+    circulares com tamanho geométrico de média `mean_block`. Tudo em arrays,
+    sem loop por reamostragem.
+    """
+    # int32/float32: metade da memória percorrida (n_boot × n pode ter milhões de células)
+    new_block = rng.random((n_boot, n), dtype=np.float32) < 1 / mean_block
+    new_block[:, 0] = True
+
+    # nº global do bloco de cada célula (soma acumulada no array achatado) e um
+    # deslocamento sorteado por bloco: idx = t + deslocamento, com volta circular
+    flat = new_block.ravel()
+    first = np.flatnonzero(flat)
+    block_id = np.cumsum(flat, dtype=np.int32) - 1
+    shift = rng.integers(0, n, size=len(first), dtype=np.int32) - (first % n).astype(np.int32)
+    idx = shift[block_id].reshape(n_boot, n) + np.arange(n, dtype=np.int32)
+    idx[idx >= n] -= n
+    return idx
+
+
+def block_indices(n: int, n_boot: int, block: int, rng: np.random.Generator) -> np.ndarray:
+    # bootstrap em blocos móveis (circulares) de tamanho fixo
+    n_blocks = -(-n // block)
+    starts = rng.integers(0, n, size=(n_boot, n_blocks))
+    idx = (starts[:, :, None] + np.arange(block)) % n
+    return idx.reshape(n_boot, -1)[:, :n]
+
+
+def resampled_metrics(samples: np.ndarray, periods_per_year: int = 252) -> dict:
+    # métricas linha a linha (cada linha = uma reamostragem), mesma definição de ml.metrics
+    mean = samples.mean(axis=1)
+    std = samples.std(axis=1, ddof=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = np.where(std == 0, 0.0, mean / std * np.sqrt(periods_per_year))
+
+    # curva e pico in-place: um buffer n_boot × n a menos por etapa
+    equity = np.add(samples, 1)
+    np.cumprod(equity, axis=1, out=equity)
+    peak = np.maximum.accumulate(equity, axis=1)
+    np.divide(equity, peak, out=peak)
+    max_dd = peak.min(axis=1) - 1
+    return {"sharpe": sharpe, "max_drawdown": max_dd}
+
+
+def bootstrap_metrics(
+    returns,
+    n_boot: int = N_BOOT,
+    block: int | None = None,
+    method: str = "stationary",
+    seed: int = SEED,
+) -> dict:
+    """
+    Distribuição bootstrap de Sharpe e max drawdown de uma série de
+    retornos (ex.: strategy_ret). As n_boot reamostragens saem de UM array
+    2D de índices e as métricas são calculadas por linha.
+    """
+    r = pd.Series(returns).dropna().to_numpy(dtype=float)
+    n = len(r)
+    if n < 2:
+        return {"sharpe": np.full(n_boot, np.nan), "max_drawdown": np.full(n_boot, np.nan)}
+
+    rng = np.random.default_rng(seed)
+    block = block or default_block(n)
+    if method == "stationary":
+        idx = stationary_indices(n, n_boot, block, rng)
+    elif method == "block":
+        idx = block_indices(n, n_boot, block, rng)
+    else:
+        raise ValueError(f"Método de bootstrap desconhecido: {method}")
+    return resampled_metrics(r[idx])
+
+
+def bootstrap_ci(returns, alpha: float = ALPHA, **kwargs) -> dict:
+    """
+    Intervalos percentis (1 - alpha) de Sharpe e max drawdown, com as
+    chaves de CI_COLS (as mesmas colunas de backtest_results e model_results).
+    """
+    dist = bootstrap_metrics(returns, **kwargs)
+    q = [100 * alpha / 2, 100 * (1 - alpha / 2)]
+    sharpe_lo, sharpe_hi = np.percentile(dist["sharpe"], q)
+    dd_lo, dd_hi = np.percentile(dist["max_drawdown"], q)
+    return {
+        "sharpe_ci_lo": float(sharpe_lo),
+        "sharpe_ci_hi": float(sharpe_hi),
+        "max_drawdown_ci_lo": float(dd_lo),
+        "max_drawdown_ci_hi": float(dd_hi),
+    }
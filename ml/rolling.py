@@ -0,0 +1,227 @@
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine, text
+
+from ml.backtest import ENGINE_URL
+from pipelines.pg_load import copy_frame, ensure_schema
+
+WINDOWS = (63, 126, 252)  # ~3, 6 e 12 meses de pregões
+
+ROLLING_COLS = ["strategy", "ticker", "date", "window_days", "sharpe", "drawdown"]
+
+
+def rolling_sum(x: np.ndarray, window: int) -> np.ndarray:
+    # soma móvel no último eixo a partir de UMA soma acumulada; antes de `window` dias fica NaN
+    cs = np.zeros(x.shape[:-1] + (x.shape[-1] + 1,))
+    np.cumsum(x, axis=-1, out=cs[..., 1:])
+    out = np.full(x.shape, np.nan)
+    out[..., window - 1:] = cs[..., window:] - cs[..., :-window]
+    return out
+
+
+def rolling_sharpe(
+    returns: np.ndarray,
+    window: int,
+    rf_daily: float = 0.0,
+    periods_per_year: int = 252,
+) -> np.ndarray:
+    """
+    Sharpe móvel (ddof=1, anualizado) de cada linha de `returns` (séries × dias)
+    em O(dias), com somas móveis de x e x². Os retornos são centrados na média
+    de cada série antes das somas para evitar cancelamento em S2 - S1²/W.
+    Janelas com NaN ficam NaN; janela constante dá 0, como sharpe_ratio.
+    """
+    r = np.atleast_2d(np.asarray(returns, dtype=float))
+    valid = ~np.isnan(r)
+    x = np.where(valid, r, 0.0)
+    center = x.sum(axis=-1, keepdims=True) / np.maximum(valid.sum(axis=-1, keepdims=True), 1)
+    x = np.where(valid, x - center, 0.0)
+
+    full = rolling_sum(valid.astype(float), window) == window
+    s1 = rolling_sum(x, window)
+    s2 = rolling_sum(x * x, window)
+
+    # janela constante (ex.: fora do mercado, retorno 0) detectada de forma exata:
+    # nenhuma mudança entre dias vizinhos; S2 - S1²/W ali seria só arredondamento
+    changes = np.zeros_like(x)
+    changes[..., 1:] = r[..., 1:] != r[..., :-1]
+    flat = rolling_sum(changes, window - 1) == 0
+
+    mean = s1 / window + center - rf_daily
+    ssd = np.maximum(s2 - s1 * s1 / window, 0.0)
+    std = np.where(flat, 0.0, np.sqrt(ssd / (window - 1)))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = np.where(std == 0, 0.0, mean / std * np.sqrt(periods_per_year))
+    return np.where(full, sharpe, np.nan)
+
+
+def _blocks(x: np.ndarray, window: int, fill: float) -> np.ndarray:
+    # x deslocado `window - 1` posições à direita (o dia t fica em t + window - 1) e
+    # cortado em blocos de `window`: a janela que termina em t ocupa, no máximo,
+    # o sufixo de um bloco e o prefixo do seguinte
+    lead = x.shape[:-1]
+    n = x.shape[-1]
+    n_blocks = -(-(n + window - 1) // window)
+    padded = np.full(lead + (n_blocks * window,), fill)
+    padded[..., window - 1:window - 1 + n] = x
+    return padded.reshape(lead + (n_blocks, window))
+
+
+def _suffix(op, blocks: np.ndarray) -> np.ndarray:
+    # acumulado de cada posição até o fim do seu bloco, achatado
+    out = op.accumulate(blocks[..., ::-1], axis=-1)[..., ::-1]
+    return out.reshape(blocks.shape[:-2] + (-1,))
+
+
+def _prefix(op, blocks: np.ndarray) -> np.ndarray:
+    # acumulado do início do bloco até cada posição, achatado
+    return op.accumulate(blocks, axis=-1).reshape(blocks.shape[:-2] + (-1,))
+
+
+def rolling_max(x: np.ndarray, window: int) -> np.ndarray:
+    """
+    Máximo móvel de `window` dias no último eixo (janelas parciais no início),
+    em O(dias) para todas as linhas de uma vez. Faz o papel do deque monotônico
+    sem loop por dia (van Herk / Gil-Werman): em blocos de `window`, o máximo
+    de qualquer janela é max(sufixo do bloco onde ela começa, prefixo do
+    bloco onde termina). NaN é ignorado.
+    """
+    x = np.atleast_2d(np.asarray(x, dtype=float))
+    n = x.shape[-1]
+    blocks = _blocks(np.where(np.isnan(x), -np.inf, x), window, -np.inf)
+    suffix = _suffix(np.maximum, blocks)
+    prefix = _prefix(np.maximum, blocks)
+    out = np.maximum(suffix[..., :n], prefix[..., window - 1:window - 1 + n])
+    return np.where(np.isneginf(out), np.nan, out)
+
+
+def rolling_drawdown(equity: np.ndarray, window: int) -> np.ndarray:
+    """
+    Max drawdown móvel: a pior queda pico → vale DENTRO de cada janela de
+    `window` dias (mesma definição de max_drawdown aplicada à janela), em
+    O(dias) com os mesmos blocos do rolling_max. A janela que termina em t é
+    A (sufixo de um bloco) + B (prefixo do seguinte), e
+      MDD = min(MDD(A), MDD(B), min(B) / max(A) - 1),
+    com MDD de sufixos e de prefixos de bloco saindo de acumulados.
+    Janelas incompletas ou com NaN ficam NaN, como no rolling_sharpe.
+    """
+    e = np.atleast_2d(np.asarray(equity, dtype=float))
+    n = e.shape[-1]
+    full = rolling_sum((~np.isnan(e)).astype(float), window) == window
+
+    blocks = _blocks(e, window, 1.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        # B = prefixo [início do bloco, t]: queda de cada dia vs o pico do prefixo
+        pre_max = np.maximum.accumulate(blocks, axis=-1)
+        pre_mdd = _prefix(np.minimum, blocks / pre_max - 1)
+        pre_min = _prefix(np.minimum, blocks)
+
+        # A = sufixo [s, fim do bloco]: queda de cada dia até o menor valor depois dele
+        suf_min = np.minimum.accumulate(blocks[..., ::-1], axis=-1)[..., ::-1]
+        suf_mdd = _suffix(np.minimum, suf_min / blocks - 1)
+        suf_max = _suffix(np.maximum, blocks)
+
+        end = np.arange(n) + window - 1          # posição do dia t no array em blocos
+        has_a = np.arange(n) % window != 0       # janela começa no meio de um bloco
+        cross = np.minimum(suf_mdd[..., :n], pre_min[..., end] / suf_max[..., :n] - 1)
+        mdd = np.where(has_a, np.minimum(pre_mdd[..., end], cross), pre_mdd[..., end])
+    return np.where(full, mdd, np.nan)
+
+
+def load_equity(engine, strategies: list[str] | None = None) -> pd.DataFrame:
+    q = """
+    SELECT strategy, ticker, date, equity::float8 AS equity, returns::float8 AS returns
+    FROM backtest_equity
+    """
+    params = {}
+    if strategies:
+        q += " WHERE strategy = ANY(%(s)s)"
+        params["s"] = list(strategies)
+    q += " ORDER BY strategy, ticker, date"
+    return pd.read_sql(q, engine, params=params)
+
+
+def run_rolling(df: pd.DataFrame, windows=WINDOWS) -> pd.DataFrame:
+    """
+    Sharpe e drawdown móveis de todas as séries (strategy, ticker) de `df`
+    (saída de load_equity) de uma vez: cada série vira uma linha de uma
+    matriz séries × dias (alinhada pela posição; o fim fica NaN).
+    Retorna formato longo, uma linha por (série, dia, janela).
+    """
+    if df.empty:
+        return pd.DataFrame(columns=ROLLING_COLS)
+
+    df = df.sort_values(["strategy", "ticker", "date"], kind="mergesort").reset_index(drop=True)
+    codes = df.groupby(["strategy", "ticker"], sort=False).ngroup().to_numpy()
+    pos = df.groupby(codes, sort=False).cumcount().to_numpy()
+
+    shape = (codes.max() + 1, pos.max() + 1)
+    returns = np.full(shape, np.nan)
+    equity = np.full(shape, np.nan)
+    returns[codes, pos] = df["returns"].to_numpy(dtype=float)
+    equity[codes, pos] = df["equity"].to_numpy(dtype=float)
+
+    parts = []
+    for w in windows:
+        parts.append(pd.DataFrame({
+            "strategy": df["strategy"],
+            "ticker": df["ticker"],
+            "date": df["date"],
+            "window_days": w,
+            "sharpe": rolling_sharpe(returns, w)[codes, pos],
+            "drawdown": rolling_drawdown(equity, w)[codes, pos],
+        }))
+    return pd.concat(parts, ignore_index=True)
+
+
+def save_rolling(engine, results: pd.DataFrame, windows=WINDOWS, strategies: list[str] | None = None):
+    # recálculo completo: troca (estratégias × janelas) calculadas numa transação só
+    q = "DELETE FROM rolling_metrics WHERE window_days = ANY(:w)"
+    params = {"w": [int(w) for w in windows]}
+    if strategies:
+        q += " AND strategy = ANY(:s)"
+        params["s"] = list(strategies)
+    with engine.begin() as conn:
+        conn.execute(text(q), params)
+        with conn.connection.cursor() as cur:
+            copy_frame(cur, "rolling_metrics", results[ROLLING_COLS])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sharpe e drawdown móveis de backtest_equity → rolling_metrics")
+    parser.add_argument("--strategy", action="append", help="só estas estratégias (pode repetir; padrão: todas)")
+    parser.add_argument("--windows", default=",".join(str(w) for w in WINDOWS), help="janelas em pregões")
+    args = parser.parse_args()
+
+    windows = [int(w) for w in args.windows.split(",")]
+    if min(windows) < 2:
+        # Sharpe com ddof=1 precisa de pelo menos 2 retornos na janela
+        parser.error(f"--windows: cada janela precisa ter pelo menos 2 pregões (recebido {args.windows})")
+    engine = create_engine(ENGINE_URL)
+    ensure_schema(engine)
+
+    t0 = time.perf_counter()
+    df = load_equity(engine, args.strategy)
+    t_load = time.perf_counter() - t0
+    if df.empty:
+        raise RuntimeError("Sem curvas em backtest_equity. Rode o backtest / modelo antes.")
+
+    t0 = time.perf_counter()
+    results = run_rolling(df, windows)
+    t_run = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    save_rolling(engine, results, windows, args.strategy)
+    t_save = time.perf_counter() - t0
+
+    n_series = df.groupby(["strategy", "ticker"]).ngroups
+    print(
+        f"✅ {n_series} séries × janelas {windows} → {len(results)} linhas em rolling_metrics | "
+        f"consulta={t_load:.2f}s cálculo={t_run:.3f}s gravação={t_save:.2f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
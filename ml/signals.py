@@ -4,6 +4,7 @@ def ma_crossover_signal(df: pd.DataFrame) -> pd.Series:
     """
     df precisa ter colunas: date, ma_20, ma_50
     Retorna posição (0 ou 1) para cada data.
+    Também aceita {"ma_20": DataFrame, "ma_50": DataFrame} largos (painel).
     """
     signal = (df["ma_20"] > df["ma_50"]).astype(int)
 
@@ -0,0 +1,220 @@
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+import argparse
+import multiprocessing as mp
+import os
+import time
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine
+
+from ml.backtest import ENGINE_URL, load_panel
+from pipelines.feature_engine import to_panel
+from pipelines.pg_load import copy_upsert, ensure_schema
+
+# grade padrão de janelas (rápida × lenta), só pares com rápida < lenta
+FAST = "5:100:5"
+SLOW = "20:250:10"
+
+# tickers por tarefa do pool (limita a memória das médias de cada tarefa)
+CHUNK_TICKERS = 64
+
+SWEEP_COLS = ["ticker", "fast", "slow", "start_date", "end_date", "cumulative_return", "sharpe", "max_drawdown"]
+
+
+def parse_windows(spec: str) -> list[int]:
+    # "5:100:5" -> 5, 10, ..., 100 (fim incluso); "20,50,200" também vale
+    if ":" in spec:
+        start, stop, step = (int(x) for x in spec.split(":"))
+        return list(range(start, stop + 1, step))
+    return [int(x) for x in spec.split(",")]
+
+
+def window_pairs(fast: list[int], slow: list[int]) -> list[tuple[int, int]]:
+    return [(f, s) for s in slow for f in fast if f < s]
+
+
+def rolling_means(close: np.ndarray, windows) -> dict[int, np.ndarray]:
+    """
+    Médias móveis de `close` (tickers × dias) para todas as janelas a partir
+    de UMA soma acumulada: MA_w[t] = (S[t] - S[t-w]) / w. Custo O(dias) por
+    janela, sem depender do tamanho da janela. Antes de w pregões fica NaN.
+    """
+    cs = np.zeros((close.shape[0], close.shape[1] + 1))
+    np.cumsum(np.nan_to_num(close, nan=0.0), axis=1, out=cs[:, 1:])
+
+    out = {}
+    for w in sorted(set(windows)):
+        ma = np.full(close.shape, np.nan)
+        ma[:, w - 1:] = (cs[:, w:] - cs[:, :-w]) / w
+        out[w] = ma
+    return out
+
+
+def sweep_chunk(close: np.ndarray, lengths: np.ndarray, pairs: list[tuple[int, int]]) -> np.ndarray:
+    """
+    Backtest MA rápida > MA lenta para um bloco de tickers (linhas de `close`)
+    e todos os pares. Retorna matriz (pares × tickers × 3) com
+    cumulative_return, sharpe e max_drawdown.
+    """
+    n_t, n_d = close.shape
+    valid = np.arange(n_d)[None, :] < lengths[:, None]
+
+    # retorno diário; fim do painel (NaN) vira 0
+    ret = np.zeros_like(close)
+    with np.errstate(invalid="ignore"):
+        ret[:, 1:] = close[:, 1:] / close[:, :-1] - 1
+    ret[~valid] = 0.0
+
+    mas = rolling_means(close, {w for p in pairs for w in p})
+    n = lengths.astype(float)
+    n_pad = n_d - n
+
+    # buffers reaproveitados entre os pares (evita alocar matrizes a cada par)
+    out = np.empty((len(pairs), n_t, 3))
+    strategy_ret = np.zeros_like(close)
+    equity = np.empty_like(close)
+    peak = np.empty_like(close)
+    for k, (f, s) in enumerate(pairs):
+        ma_f, ma_s = mas[f], mas[s]
+
+        # posição de hoje decide o retorno de amanhã (NaN da MA lenta compara como False)
+        with np.errstate(invalid="ignore"):
+            position = ma_f[:, :-1] > ma_s[:, :-1]
+        np.multiply(position, ret[:, 1:], out=strategy_ret[:, 1:])
+
+        np.add(strategy_ret, 1, out=equity)
+        np.cumprod(equity, axis=1, out=equity)
+        np.maximum.accumulate(equity, axis=1, out=peak)
+        np.divide(equity, peak, out=peak)
+        drawdown = peak.min(axis=1) - 1
+
+        # duas passadas; o fim do painel (retorno 0) soma mean² por dia e é descontado
+        mean = strategy_ret.sum(axis=1) / n
+        sq = np.subtract(strategy_ret, mean[:, None], out=peak)
+        np.square(sq, out=sq)
+        var = (sq.sum(axis=1) - n_pad * mean ** 2) / (n - 1)
+        std = np.sqrt(np.maximum(var, 0))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sharpe = np.where(std == 0, 0.0, (mean / std) * np.sqrt(252))
+
+        out[k, :, 0] = equity[:, -1] - 1
+        out[k, :, 1] = sharpe
+        out[k, :, 2] = drawdown
+    return out
+
+
+def run_sweep(
+    df: pd.DataFrame,
+    fast: list[int],
+    slow: list[int],
+    workers: int = 1,
+    min_rows: int = 60,
+    chunk: int = CHUNK_TICKERS,
+) -> pd.DataFrame:
+    """
+    Avalia todos os pares (rápida, lenta) para todos os tickers de `df`
+    (ticker, date, close). Os tickers são divididos em blocos de `chunk`,
+    distribuídos num pool de `workers` processos; cada bloco calcula cada
+    média uma vez só e a reaproveita em todos os pares.
+    """
+    pairs = window_pairs(fast, slow)
+    df = df[df.groupby("ticker")["date"].transform("size") >= min_rows]
+    if df.empty or not pairs:
+        return pd.DataFrame(columns=SWEEP_COLS)
+
+    df = df.sort_values(["ticker", "date"], kind="mergesort").reset_index(drop=True)
+    panels, tickers, pos, codes = to_panel(df, ["close"])
+    close = np.ascontiguousarray(panels["close"].T)
+    lengths = np.bincount(codes, minlength=len(tickers))
+
+    blocks = [slice(i, i + chunk) for i in range(0, len(tickers), chunk)]
+    closes = [close[b] for b in blocks]
+    lens = [lengths[b] for b in blocks]
+
+    if workers > 1:
+        # spawn: o processo pai pode ter threads (pyarrow/psycopg) abertas
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context("spawn")) as pool:
+            parts = list(pool.map(sweep_chunk, closes, lens, repeat(pairs)))
+    else:
+        parts = [sweep_chunk(c, l, pairs) for c, l in zip(closes, lens)]
+    metrics = np.concatenate(parts, axis=1)  # pares × tickers × 3
+
+    first = np.flatnonzero(pos == 0)
+    last = np.append(first[1:], len(df)) - 1
+    dates = df["date"].to_numpy()
+
+    n_p, n_t = len(pairs), len(tickers)
+    pair_idx = np.repeat(np.arange(n_p), n_t)
+    tick_idx = np.tile(np.arange(n_t), n_p)
+    pairs_arr = np.asarray(pairs)
+    return pd.DataFrame({
+        "ticker": np.asarray(tickers)[tick_idx],
+        "fast": pairs_arr[pair_idx, 0],
+        "slow": pairs_arr[pair_idx, 1],
+        "start_date": dates[first][tick_idx],
+        "end_date": dates[last][tick_idx],
+        "cumulative_return": metrics[:, :, 0].ravel(),
+        "sharpe": metrics[:, :, 1].ravel(),
+        "max_drawdown": metrics[:, :, 2].ravel(),
+    })
+
+
+def best_pairs(results: pd.DataFrame, top: int = 10) -> pd.DataFrame:
+    # ranking dos pares pela mediana do Sharpe entre tickers (robusto a outliers)
+    g = results.groupby(["fast", "slow"])
+    summary = pd.DataFrame({
+        "sharpe_median": g["sharpe"].median(),
+        "sharpe_mean": g["sharpe"].mean(),
+        "ret_median": g["cumulative_return"].median(),
+        "dd_median": g["max_drawdown"].median(),
+        "pct_positive": g["cumulative_return"].apply(lambda x: (x > 0).mean()),
+    })
+    return summary.sort_values("sharpe_median", ascending=False).head(top).reset_index()
+
+
+def save_sweep(engine, results: pd.DataFrame, chunk_rows: int = 100_000) -> int:
+    # COPY + upsert por (ticker, fast, slow), tudo numa transação
+    frames = (results.iloc[i:i + chunk_rows] for i in range(0, len(results), chunk_rows))
+    with engine.begin() as conn:
+        with conn.connection.cursor() as cur:
+            return copy_upsert(cur, "backtest_sweep", frames, SWEEP_COLS, keys=("ticker", "fast", "slow"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Varredura de janelas do cruzamento de médias → backtest_sweep")
+    parser.add_argument("--fast", default=FAST, help="janelas da MA rápida (início:fim:passo ou lista)")
+    parser.add_argument("--slow", default=SLOW, help="janelas da MA lenta (início:fim:passo ou lista)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="processos")
+    parser.add_argument("--top", type=int, default=10, help="quantos pares mostrar no ranking")
+    parser.add_argument("--no-save", action="store_true", help="só mostra o ranking, não grava no banco")
+    args = parser.parse_args()
+
+    fast, slow = parse_windows(args.fast), parse_windows(args.slow)
+    engine = create_engine(ENGINE_URL)
+    ensure_schema(engine)
+
+    t0 = time.perf_counter()
+    df = load_panel(engine)[["ticker", "date", "close"]]
+    t_load = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    results = run_sweep(df, fast, slow, workers=args.workers)
+    t_run = time.perf_counter() - t0
+
+    n_pairs = len(window_pairs(fast, slow))
+    n_tickers = results["ticker"].nunique()
+    print(
+        f"✅ {n_pairs} pares × {n_tickers} tickers = {len(results)} configurações | "
+        f"consulta={t_load:.2f}s varredura={t_run:.2f}s ({len(results) / max(t_run, 1e-9):,.0f} config/s)"
+    )
+
+    print(best_pairs(results, args.top).to_string(index=False, float_format=lambda x: f"{x:.3f}"))
+
+    if not args.no_save:
+        rows = save_sweep(engine, results)
+        print(f" Varredura salva em backtest_sweep ({rows} linhas).")
+
+
+if __name__ == "__main__":
+    main()
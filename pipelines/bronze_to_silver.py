@@ -1,27 +1,113 @@
-from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import multiprocessing as mp
 import pandas as pd
-import numpy as np
 
-Path("data/silver").mkdir(parents=True, exist_ok=True)
+from pipelines.feature_engine import compute_features, compute_features_incremental, warmup_tail
+from pipelines.lake import BRONZE_ROOT, SILVER_ROOT, list_tickers, read_lake, upsert_lake, write_lake
 
-def rsi(series: pd.Series, period: int = 14) -> pd.Series:
-    delta = series.diff()
-    gain = delta.clip(lower=0).rolling(period).mean()
-    loss = (-delta.clip(upper=0)).rolling(period).mean()
-    rs = gain / loss.replace(0, np.nan)
-    return 100 - (100 / (1 + rs))
+# estado de warm-up (últimas closes por ticker); prefixo "_" fica fora do dataset
+STATE_PATH = SILVER_ROOT / "_warmup.parquet"
+STATE_COLS = ["ticker", "date", "close"]
 
-for file in Path("data/bronze").glob("*.parquet"):
-    df = pd.read_parquet(file).sort_values("date")
 
-    df["ret_1d"] = df["close"].pct_change()
-    df["ma_20"] = df["close"].rolling(20).mean()
-    df["ma_50"] = df["close"].rolling(50).mean()
-    df["volatility_20"] = df["ret_1d"].rolling(20).std()
-    df["rsi_14"] = rsi(df["close"], 14)
+def load_state() -> pd.DataFrame:
+    if not STATE_PATH.exists():
+        return pd.DataFrame(columns=STATE_COLS)
+    return pd.read_parquet(STATE_PATH)
 
-    out = Path("data/silver") / file.name
-    df.to_parquet(out, index=False)
-    print(f" Silver: {file.name}")
 
-print(" Concluído: Silver")
+def save_state(state: pd.DataFrame):
+    SILVER_ROOT.mkdir(parents=True, exist_ok=True)
+    state = state.sort_values(["ticker", "date"]).reset_index(drop=True)
+    state.to_parquet(STATE_PATH, index=False)
+
+
+def run_full(tickers: list[str]) -> tuple[int, pd.DataFrame]:
+    # tickers do shard num painel só: uma leitura, uma passada de features, uma escrita
+    bronze = read_lake(BRONZE_ROOT, tickers=tickers)
+    silver = compute_features(bronze)
+    write_lake(silver, SILVER_ROOT)
+    return len(silver), warmup_tail(silver)
+
+
+def run_incremental(tickers: list[str], state: pd.DataFrame) -> tuple[int, pd.DataFrame]:
+    # watermark por ticker = última data do estado; só lê o bronze a partir do menor deles
+    marks = state.groupby("ticker")["date"].max()
+    known = [t for t in tickers if t in marks.index]
+    new = pd.DataFrame()
+    if known:
+        bronze = read_lake(BRONZE_ROOT, tickers=known, start=marks[known].min())
+        # >=: o ingest re-baixa o dia do watermark (pregão parcial), então ele é recalculado
+        new = bronze[bronze["date"] >= bronze["ticker"].map(marks)]
+
+    # ticker novo (sem estado) precisa do histórico inteiro
+    fresh = [t for t in tickers if t not in marks.index]
+    if fresh:
+        new = pd.concat([new, read_lake(BRONZE_ROOT, tickers=fresh)], ignore_index=True)
+
+    if new.empty:
+        return 0, state[STATE_COLS]
+
+    silver = compute_features_incremental(state, new)
+    upsert_lake(silver, SILVER_ROOT)
+
+    merged = (
+        pd.concat([state[STATE_COLS], silver[STATE_COLS]], ignore_index=True)
+        .drop_duplicates(subset=["ticker", "date"], keep="last")
+    )
+    return len(silver), warmup_tail(merged)
+
+
+def run_shard(tickers: list[str], state: pd.DataFrame | None) -> tuple[int, pd.DataFrame]:
+    # cada worker calcula e grava as partições dos seus tickers (ticker=… é disjunto entre shards)
+    if state is None:
+        return run_full(tickers)
+    return run_incremental(tickers, state)
+
+
+def run(full: bool = False, workers: int = 1) -> tuple[int, int]:
+    """
+    Executa Bronze → Silver. Com workers > 1, os tickers são divididos em
+    shards fixos (ordem alfabética, round-robin) e processados num pool de
+    processos; a saída é a mesma da execução serial.
+    Retorna (nº de tickers, nº de linhas gravadas).
+    """
+    tickers = list_tickers(BRONZE_ROOT)
+    if not tickers:
+        print(f" Sem tickers em {BRONZE_ROOT}. Rode o ingest antes.")
+        return 0, 0
+
+    state = None if full else load_state()
+    if state is not None and state.empty:
+        state = None
+
+    n_shards = max(1, min(workers, len(tickers)))
+    shards = [tickers[i::n_shards] for i in range(n_shards)]
+    states = [None if state is None else state[state["ticker"].isin(s)] for s in shards]
+
+    if n_shards == 1:
+        results = [run_shard(shards[0], states[0])]
+    else:
+        # spawn: evita herdar threads do pyarrow no fork
+        with ProcessPoolExecutor(max_workers=n_shards, mp_context=mp.get_context("spawn")) as pool:
+            results = list(pool.map(run_shard, shards, states))
+
+    save_state(pd.concat([tail for _, tail in results], ignore_index=True))
+    return len(tickers), sum(n for n, _ in results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bronze → Silver (features diárias)")
+    parser.add_argument("--full", action="store_true", help="recalcula todo o histórico")
+    parser.add_argument("--workers", type=int, default=1, help="processos em paralelo (shards de tickers)")
+    args = parser.parse_args()
+
+    n_tickers, n_rows = run(full=args.full, workers=args.workers)
+
+    print(f" Silver: {n_tickers} tickers, {n_rows} linhas")
+    print(" Concluído: Silver")
+
+
+if __name__ == "__main__":
+    main()
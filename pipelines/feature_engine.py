@@ -0,0 +1,203 @@
+import numpy as np
+import pandas as pd
+
+FEATURE_COLS = ["ret_1d", "ma_20", "ma_50", "volatility_20", "rsi_14"]
+
+# ---------------------------------------------------------------------------
+# Registro de features
+#
+# Cada feature declara suas entradas (colunas brutas ou outras features) e a
+# janela que consome. As funções só usam operações do pandas que valem tanto
+# para Series (1 ticker) quanto para DataFrame largo (dias × tickers).
+# ---------------------------------------------------------------------------
+
+FEATURES: dict[str, dict] = {}
+
+
+def feature(name: str, inputs: tuple[str, ...], window: int = 1):
+    def register(fn):
+        FEATURES[name] = {"inputs": tuple(inputs), "window": window, "fn": fn}
+        return fn
+    return register
+
+
+@feature("ret_1d", inputs=("close",), window=2)
+def _ret_1d(close):
+    return close.pct_change()
+
+
+@feature("ret_5d_fwd", inputs=("close",), window=6)
+def _ret_5d_fwd(close):
+    # alvo (olha 5 dias à frente): não entra no warm-up incremental
+    return close.pct_change(5).shift(-5)
+
+
+@feature("ma_20", inputs=("close",), window=20)
+def _ma_20(close):
+    return close.rolling(20).mean()
+
+
+@feature("ma_50", inputs=("close",), window=50)
+def _ma_50(close):
+    return close.rolling(50).mean()
+
+
+@feature("volatility_20", inputs=("ret_1d",), window=20)
+def _volatility_20(ret_1d):
+    return ret_1d.rolling(20).std()
+
+
+@feature("delta", inputs=("close",), window=2)
+def _delta(close):
+    return close.diff()
+
+
+@feature("gain_14", inputs=("delta",), window=14)
+def _gain_14(delta):
+    return delta.clip(lower=0).rolling(14).mean()
+
+
+@feature("loss_14", inputs=("delta",), window=14)
+def _loss_14(delta):
+    return (-delta.clip(upper=0)).rolling(14).mean()
+
+
+@feature("rsi_14", inputs=("gain_14", "loss_14"))
+def _rsi_14(gain, loss):
+    rs = gain / loss.replace(0, np.nan)
+    return 100 - (100 / (1 + rs))
+
+
+@feature("sentiment_3d", inputs=("avg_sentiment",), window=3)
+def _sentiment_3d(avg_sentiment):
+    return avg_sentiment.rolling(3).mean()
+
+
+def resolve(names) -> list[str]:
+    """
+    Ordem topológica de todas as features necessárias para `names`
+    (cada intermediário aparece uma vez só).
+    """
+    order, seen = [], set()
+
+    def visit(name, path=()):
+        if name in seen or name not in FEATURES:
+            return
+        if name in path:
+            raise ValueError(f"Ciclo no registro de features: {' -> '.join(path + (name,))}")
+        for dep in FEATURES[name]["inputs"]:
+            visit(dep, path + (name,))
+        seen.add(name)
+        order.append(name)
+
+    for n in names:
+        if n not in FEATURES:
+            raise KeyError(f"Feature desconhecida: {n}")
+        visit(n)
+    return order
+
+
+def raw_inputs(names) -> list[str]:
+    # colunas brutas (fora do registro) que as features pedidas consomem
+    cols = {dep for n in resolve(names) for dep in FEATURES[n]["inputs"] if dep not in FEATURES}
+    return sorted(cols)
+
+
+def warmup(names) -> int:
+    # histórico mínimo (em linhas) para a última linha de cada feature estar completa
+    def need(name):
+        if name not in FEATURES:
+            return 1
+        spec = FEATURES[name]
+        return spec["window"] + max(need(d) for d in spec["inputs"]) - 1
+    return max(need(n) for n in names)
+
+
+def evaluate(data: dict, names) -> dict:
+    """
+    Avalia o DAG sobre `data` (coluna bruta -> Series ou DataFrame largo).
+    Cada nó é calculado uma vez; só as features pedidas são devolvidas.
+    """
+    cache = dict(data)
+    for name in resolve(names):
+        spec = FEATURES[name]
+        cache[name] = spec["fn"](*[cache[d] for d in spec["inputs"]])
+    return {n: cache[n] for n in names}
+
+
+def add_features(df: pd.DataFrame, names) -> pd.DataFrame:
+    # versão para 1 ticker (df ordenado por date), usada em ml/ e nas páginas do app
+    df = df.copy()
+    for name, values in evaluate({c: df[c] for c in raw_inputs(names)}, names).items():
+        df[name] = values
+    return df
+
+
+def to_panel(df: pd.DataFrame, cols: list[str]):
+    """
+    Empilha todos os tickers em matrizes dias × tickers alinhadas pela posição
+    (linha i = i-ésimo pregão de cada ticker; o fim é completado com NaN).
+    Assim as janelas de cada coluna são exatamente as do caminho por ticker.
+    Retorna ({col: matriz}, tickers, linha, coluna) para desfazer o empilhamento.
+    """
+    df = df.sort_values(["ticker", "date"], kind="mergesort")
+    codes, tickers = pd.factorize(df["ticker"], sort=True)
+    pos = df.groupby(codes, sort=False).cumcount().to_numpy()
+
+    panels = {}
+    for col in cols:
+        panel = np.full((pos.max() + 1, len(tickers)), np.nan)
+        panel[pos, codes] = df[col].to_numpy(dtype=float)
+        panels[col] = panel
+    return panels, list(tickers), pos, codes
+
+
+def compute_features(df: pd.DataFrame, names=FEATURE_COLS) -> pd.DataFrame:
+    """
+    Features de todos os tickers numa passada só sobre o painel dias × tickers.
+    Usa os mesmos kernels de rolling do pandas, então o resultado é idêntico
+    (bit a bit) ao cálculo ticker a ticker (conferido em benchmarks/bench_feature_engine).
+    """
+    names = list(names)
+    if df.empty:
+        return df.assign(**{c: pd.Series(dtype=float) for c in names})
+
+    df = df.sort_values(["ticker", "date"], kind="mergesort").reset_index(drop=True)
+    panels, _, pos, codes = to_panel(df, raw_inputs(names))
+
+    wide = evaluate({c: pd.DataFrame(p) for c, p in panels.items()}, names)
+    for name, frame in wide.items():
+        df[name] = frame.to_numpy()[pos, codes]
+    return df
+
+
+# maior histórico exigido pelas features do silver (ma_50); cobre também as
+# 21 closes da volatility_20 e as 15 closes (14 deltas) do rsi_14
+WARMUP = warmup(FEATURE_COLS)
+
+
+def warmup_tail(df: pd.DataFrame, n: int = WARMUP) -> pd.DataFrame:
+    # estado mínimo por ticker para continuar as janelas: últimas n closes
+    df = df.sort_values(["ticker", "date"], kind="mergesort")
+    return df.groupby("ticker", sort=False).tail(n)[["ticker", "date", "close"]].reset_index(drop=True)
+
+
+def compute_features_incremental(state: pd.DataFrame, new: pd.DataFrame) -> pd.DataFrame:
+    """
+    Calcula features só das linhas novas, usando `state` (warm-up por ticker)
+    como histórico. Custo proporcional a (WARMUP + dias novos) por ticker.
+    Um dia presente nos dois (ex.: o do watermark, re-baixado pelo ingest)
+    vale a versão de `new` e é recalculado.
+    """
+    if new.empty:
+        return compute_features(new)
+
+    state = state[state["ticker"].isin(new["ticker"].unique())]
+    key = pd.MultiIndex.from_frame(state[["ticker", "date"]])
+    state = state[~key.isin(pd.MultiIndex.from_frame(new[["ticker", "date"]]))].copy()
+    state["_warmup"] = True
+    new = new.copy()
+    new["_warmup"] = False
+
+    out = compute_features(pd.concat([state, new], ignore_index=True))
+    return out[~out["_warmup"].astype(bool)].drop(columns="_warmup").reset_index(drop=True)
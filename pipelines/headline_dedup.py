@@ -0,0 +1,103 @@
+import re
+import zlib
+import numpy as np
+import pandas as pd
+
+from pipelines.sentiment_cache import normalize_title
+
+NUM_PERM = 64
+BANDS = 16            # 16 bandas × 4 linhas: candidato a partir de ~50% de similaridade
+THRESHOLD = 0.6       # Jaccard estimado mínimo para juntar dois títulos
+SHINGLE = 5           # k-gramas de caracteres
+
+# hash universal (a·x + b) mod p, com p primo < 2^32 para não estourar uint64
+_PRIME = np.uint64(4294967291)
+_rng = np.random.default_rng(20240101)
+_A = _rng.integers(1, 4294967291, NUM_PERM, dtype=np.uint64)
+_B = _rng.integers(0, 4294967291, NUM_PERM, dtype=np.uint64)
+
+# "Título da matéria - Veículo": o veículo muda entre cópias da mesma notícia
+_SOURCE_SUFFIX = re.compile(r"\s+[-–|]\s+[^-–|]{1,60}$")
+
+
+def shingles(title: str, k: int = SHINGLE) -> np.ndarray:
+    t = normalize_title(_SOURCE_SUFFIX.sub("", title))
+    t = re.sub(r"[^\w ]+", "", t)
+    if len(t) <= k:
+        grams = {t}
+    else:
+        grams = {t[i:i + k] for i in range(len(t) - k + 1)}
+    return np.fromiter((zlib.crc32(g.encode("utf-8")) for g in grams), dtype=np.uint64)
+
+
+def minhash(titles: list[str]) -> np.ndarray:
+    # assinatura (n_titulos × NUM_PERM): mínimo de cada permutação sobre os shingles
+    sig = np.empty((len(titles), NUM_PERM), dtype=np.uint64)
+    for i, title in enumerate(titles):
+        h = shingles(title)
+        sig[i] = ((np.outer(h, _A) + _B) % _PRIME).min(axis=0)
+    return sig
+
+
+def cluster_titles(titles: list[str], threshold: float = THRESHOLD) -> np.ndarray:
+    """
+    Agrupa títulos quase iguais (MinHash + LSH por bandas).
+    Só pares que caem no mesmo balde de alguma banda são comparados,
+    então o custo é ~linear no nº de títulos.
+    Retorna o id do cluster de cada título (= índice do primeiro título do cluster).
+    """
+    n = len(titles)
+    parent = np.arange(n)
+    if n < 2:
+        return parent
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    sig = minhash(titles)
+    rows = NUM_PERM // BANDS
+    for b in range(BANDS):
+        buckets = {}
+        for i, key in enumerate(map(bytes, sig[:, b * rows:(b + 1) * rows])):
+            buckets.setdefault(key, []).append(i)
+
+        # baldes costumam ter 1-3 títulos: comparação exaustiva só dentro deles
+        for members in buckets.values():
+            for x, i in enumerate(members):
+                for j in members[x + 1:]:
+                    ri, rj = find(i), find(j)
+                    if ri != rj and np.mean(sig[i] == sig[j]) >= threshold:
+                        parent[max(ri, rj)] = min(ri, rj)
+
+    return np.array([find(i) for i in range(n)])
+
+
+def dedup_headlines(df: pd.DataFrame, weighting: str = "split", threshold: float = THRESHOLD) -> pd.DataFrame:
+    """
+    Marca clusters de títulos quase duplicados em df (coluna title).
+
+    Adiciona:
+    - cluster: id do cluster
+    - is_rep: representante do cluster (o único que vai para o modelo)
+    - weight: peso de cada linha na média diária
+        "one"   → só o representante conta
+        "split" → cada notícia soma 1, dividido entre suas cópias
+        "all"   → toda cópia conta 1 (comportamento antigo)
+    """
+    if weighting not in ("one", "split", "all"):
+        raise ValueError(f"weighting inválido: {weighting}")
+
+    df = df.reset_index(drop=True).copy()
+    df["cluster"] = cluster_titles(df["title"].tolist(), threshold)
+    df["is_rep"] = df.index == df["cluster"]
+
+    if weighting == "one":
+        df["weight"] = df["is_rep"].astype(float)
+    elif weighting == "split":
+        df["weight"] = 1.0 / df.groupby("cluster")["title"].transform("size")
+    else:
+        df["weight"] = 1.0
+    return df
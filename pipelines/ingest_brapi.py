@@ -1,24 +1,82 @@
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import argparse
 import os
+import random
+import threading
+import time
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
 
+from pipelines.lake import BRONZE_ROOT, max_date, upsert_lake, write_lake
+
 load_dotenv()
 
 TICKERS = ["PETR4", "VALE3", "ITUB4", "BBDC4", "WEGE3", "ABEV3", "BBAS3", "B3SA3", "MGLU3"]
-BASE = "https://brapi.dev/api/quote"
+BASE = os.getenv("BRAPI_BASE", "https://brapi.dev/api/quote")
 
 TOKEN = os.getenv("BRAPI_TOKEN")
 HEADERS = {"Authorization": f"Bearer {TOKEN}"} if TOKEN else {}
 
-Path("data/bronze").mkdir(parents=True, exist_ok=True)
+# códigos HTTP que valem nova tentativa (rate limit / erro do servidor)
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+# ranges aceitos pela brapi e quantos dias corridos cada um cobre (o resto é "max")
+RANGES = [
+    ("1d", 1), ("5d", 5), ("1mo", 31), ("3mo", 92), ("6mo", 183),
+    ("1y", 366), ("2y", 731), ("5y", 1827), ("10y", 3653),
+]
+
+# colunas do relatório por ticker (uma linha por ingest_ticker)
+OUTCOME_COLS = ["ticker", "status", "range", "rows", "attempts", "elapsed", "error"]
+
+
+class FetchError(RuntimeError):
+    """Falha ao buscar 1 ticker; guarda quantas tentativas foram feitas."""
+
+    def __init__(self, message: str, attempts: int):
+        super().__init__(message)
+        self.attempts = attempts
+
+
+class TokenBucket:
+    """
+    Rate limiter thread-safe: `rate` requisições/s, com rajada de até `capacity`.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
 
-def fetch_history(ticker: str) -> pd.DataFrame:
-    url = f"{BASE}/{ticker}?range=1y&interval=1d"
-    r = requests.get(url, headers=HEADERS, timeout=30)
-    data = r.json()
+def make_session(pool_size: int = 10) -> requests.Session:
+    # sessão com pool de conexões (keep-alive) compartilhada entre as threads
+    s = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    s.mount("http://", adapter)
+    s.mount("https://", adapter)
+    s.headers.update(HEADERS)
+    return s
 
+
+def parse_history(ticker: str, data: dict) -> pd.DataFrame:
     if data.get("error"):
         raise RuntimeError(f"{ticker}: {data.get('message')} ({data.get('code')})")
 
@@ -32,15 +90,219 @@ def fetch_history(ticker: str) -> pd.DataFrame:
     df["ticker"] = ticker
     return df[["ticker", "date", "open", "high", "low", "close", "volume"]].sort_values("date")
 
-ok, fail = 0, 0
-for t in TICKERS:
+
+def api_error(r: requests.Response) -> str:
+    # a brapi explica o erro no corpo ({"error": true, "message": ..., "code": ...})
     try:
-        df = fetch_history(t)
-        df.to_parquet(Path("data/bronze") / f"{t}.parquet", index=False)
-        print(f"✅ Bronze: {t} ({len(df)} linhas)")
-        ok += 1
+        data = r.json()
+    except ValueError:
+        data = None
+    if isinstance(data, dict) and data.get("message"):
+        code = data.get("code")
+        return f"{data['message']} ({code})" if code else str(data["message"])
+    return r.reason or r.text[:200]
+
+
+def read_watermark(ticker: str) -> pd.Timestamp | None:
+    # última data já gravada no bronze (só a partição do ano mais recente)
+    return max_date(BRONZE_ROOT, ticker)
+
+
+def range_for_gap(last_date: pd.Timestamp | None, today: pd.Timestamp, full_range: str = "1y") -> str | None:
+    """
+    Menor range da brapi que cobre a janela que falta desde `last_date`.
+    None = nada a buscar; sem watermark usa `full_range` (backfill).
+    """
+    if last_date is None:
+        return full_range
+
+    gap = (today.normalize() - pd.Timestamp(last_date).normalize()).days
+    if gap <= 0:
+        return None
+
+    for name, days in RANGES:
+        if days >= gap:
+            return name
+    return "max"
+
+
+def fetch_history(
+    ticker: str,
+    session: requests.Session | None = None,
+    bucket: TokenBucket | None = None,
+    max_retries: int = 4,
+    backoff: float = 0.5,
+    base_url: str = BASE,
+    range_: str = "1y",
+) -> tuple[pd.DataFrame, int]:
+    """
+    Busca o histórico de 1 ticker com retry + backoff exponencial em 429/5xx.
+    Retorna (df, nº de tentativas); falhas levantam FetchError com a
+    mensagem da brapi e o nº de tentativas.
+    """
+    http = session or requests
+    url = f"{base_url}/{ticker}?range={range_}&interval=1d"
+
+    for attempt in range(1, max_retries + 2):
+        if bucket is not None:
+            bucket.acquire()
+
+        try:
+            r = http.get(url, headers=HEADERS, timeout=30)
+        except requests.RequestException as e:
+            if attempt > max_retries:
+                raise FetchError(f"{ticker}: {e}", attempt) from e
+            time.sleep(backoff * 2 ** (attempt - 1) * (1 + random.random()))
+            continue
+
+        if r.status_code in RETRY_STATUS:
+            if attempt > max_retries:
+                raise FetchError(f"{ticker}: HTTP {r.status_code} após {attempt} tentativas: {api_error(r)}", attempt)
+            # respeita Retry-After quando o servidor informa
+            retry_after = r.headers.get("Retry-After")
+            try:
+                wait = float(retry_after)
+            except (TypeError, ValueError):
+                wait = backoff * 2 ** (attempt - 1) * (1 + random.random())
+            time.sleep(wait)
+            continue
+
+        if not r.ok:
+            # 4xx (ticker desconhecido, token inválido…): não adianta repetir
+            raise FetchError(f"{ticker}: HTTP {r.status_code}: {api_error(r)}", attempt)
+        try:
+            return parse_history(ticker, r.json()), attempt
+        except (RuntimeError, ValueError) as e:
+            raise FetchError(str(e), attempt) from e
+
+    raise FetchError(f"{ticker}: tentativas esgotadas", max_retries + 1)
+
+
+def ingest_ticker(
+    ticker: str,
+    session,
+    bucket,
+    max_retries: int,
+    base_url: str,
+    full: bool = False,
+    full_range: str = "1y",
+) -> dict:
+    t0 = time.perf_counter()
+    outcome = {
+        "ticker": ticker, "status": "ok", "range": None, "rows": 0,
+        "attempts": 0, "elapsed": 0.0, "error": None,
+    }
+    try:
+        last = None if full else read_watermark(ticker)
+        range_ = range_for_gap(last, pd.Timestamp.now(), full_range)
+        outcome["range"] = range_
+
+        if range_ is None:
+            outcome["status"] = "up_to_date"
+        else:
+            df, attempts = fetch_history(
+                ticker, session, bucket, max_retries=max_retries, base_url=base_url, range_=range_
+            )
+            if full:
+                write_lake(df, BRONZE_ROOT)
+                rows = len(df)
+            else:
+                # o range pode trazer dias já gravados; só entra o que passa do watermark
+                if last is not None:
+                    df = df[df["date"] >= last]
+                rows = upsert_lake(df, BRONZE_ROOT)
+            outcome.update(rows=rows, attempts=attempts)
+    except FetchError as e:
+        outcome.update(status="fail", error=str(e), attempts=e.attempts)
     except Exception as e:
-        print(f" Pulando {t}: {e}")
-        fail += 1
+        outcome.update(status="fail", error=str(e))
+    outcome["elapsed"] = time.perf_counter() - t0
+    return outcome
+
+
+def ingest(
+    tickers: list[str],
+    workers: int = 8,
+    rate: float = 10.0,
+    max_retries: int = 4,
+    base_url: str = BASE,
+    full: bool = False,
+    full_range: str = "1y",
+) -> pd.DataFrame:
+    """
+    Ingestão concorrente: `workers` threads, limitadas a `rate` req/s.
+    Por padrão é incremental (a partir do watermark de cada ticker);
+    `full=True` refaz o histórico inteiro de `full_range`.
+    Retorna um relatório com o resultado de cada ticker.
+    """
+    BRONZE_ROOT.mkdir(parents=True, exist_ok=True)
+    session = make_session(workers)
+    bucket = TokenBucket(rate) if rate > 0 else None
+
+    outcomes = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(ingest_ticker, t, session, bucket, max_retries, base_url, full, full_range)
+            for t in tickers
+        ]
+        for fut in as_completed(futures):
+            o = fut.result()
+            if o["status"] == "ok":
+                print(f"✅ Bronze: {o['ticker']} (+{o['rows']} linhas, range={o['range']}, tentativas={o['attempts']})")
+            elif o["status"] == "up_to_date":
+                print(f" Bronze: {o['ticker']} já atualizado")
+            else:
+                print(f" Pulando {o['ticker']}: {o['error']}")
+            outcomes.append(o)
+
+    return pd.DataFrame(outcomes, columns=OUTCOME_COLS).sort_values("ticker").reset_index(drop=True)
+
+
+def load_tickers(path: str | None) -> list[str]:
+    if not path:
+        return TICKERS
+    lines = Path(path).read_text(encoding="utf-8").splitlines()
+    return [l.strip().upper() for l in lines if l.strip() and not l.startswith("#")]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingestão de preços (brapi) para a camada Bronze")
+    parser.add_argument("--tickers-file", help="arquivo com 1 ticker por linha (padrão: TICKERS)")
+    parser.add_argument("--workers", type=int, default=8, help="requisições simultâneas")
+    parser.add_argument("--rate", type=float, default=10.0, help="limite de req/s (0 = sem limite)")
+    parser.add_argument("--retries", type=int, default=4, help="tentativas extras em 429/5xx")
+    parser.add_argument("--base-url", default=BASE, help="endpoint /api/quote (ex.: servidor stub local)")
+    parser.add_argument("--full", action="store_true", help="ignora o watermark e refaz o histórico")
+    parser.add_argument(
+        "--backfill-range",
+        default="1y",
+        choices=[r for r, _ in RANGES] + ["max"],
+        help="range usado em --full e em tickers ainda sem bronze",
+    )
+    parser.add_argument("--report", help="salva o relatório por ticker em CSV")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    report = ingest(
+        load_tickers(args.tickers_file),
+        workers=args.workers,
+        rate=args.rate,
+        max_retries=args.retries,
+        base_url=args.base_url,
+        full=args.full,
+        full_range=args.backfill_range,
+    )
+    if args.report:
+        report.to_csv(args.report, index=False)
+
+    ok = int((report["status"] == "ok").sum())
+    fresh = int((report["status"] == "up_to_date").sum())
+    fail = int((report["status"] == "fail").sum())
+    print(
+        f" Concluído: Bronze | ok={ok} atualizados={fresh} fail={fail} | "
+        f"linhas={int(report['rows'].sum())} | {time.perf_counter() - t0:.1f}s"
+    )
+
 
-print(f" Concluído: Bronze | ok={ok} fail={fail}")
+if __name__ == "__main__":
+    main()
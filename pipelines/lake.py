@@ -0,0 +1,156 @@
+from pathlib import Path
+import argparse
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+BRONZE_ROOT = Path("data/bronze")
+SILVER_ROOT = Path("data/silver")
+
+# layout Hive: <root>/ticker=PETR4/year=2025/part-0.parquet
+PARTITIONING = ds.partitioning(
+    pa.schema([("ticker", pa.string()), ("year", pa.int32())]),
+    flavor="hive",
+)
+
+ROW_GROUP_SIZE = 64_000
+
+
+def _dataset(root: Path) -> ds.Dataset | None:
+    root = Path(root)
+    if not root.exists() or not any(root.glob("ticker=*")):
+        return None
+    return ds.dataset(root, format="parquet", partitioning=PARTITIONING)
+
+
+def _filter(tickers=None, start=None, end=None):
+    # filtros de partição (ticker/year) podam diretórios; o de date usa estatísticas dos row groups
+    expr = None
+
+    def _and(e):
+        nonlocal expr
+        expr = e if expr is None else expr & e
+
+    if tickers is not None:
+        _and(ds.field("ticker").isin(list(tickers)))
+    if start is not None:
+        start = pd.Timestamp(start)
+        _and(ds.field("year") >= start.year)
+        _and(ds.field("date") >= start)
+    if end is not None:
+        end = pd.Timestamp(end)
+        _and(ds.field("year") <= end.year)
+        _and(ds.field("date") <= end)
+    return expr
+
+
+def write_lake(df: pd.DataFrame, root: Path):
+    """
+    Grava df (com ticker e date) no layout particionado por ticker/year.
+    Partições (ticker, year) presentes em df são substituídas inteiras;
+    as demais ficam intactas.
+    """
+    if df.empty:
+        return
+
+    df = df.sort_values(["ticker", "date"]).copy()
+    df["year"] = pd.to_datetime(df["date"]).dt.year.astype("int32")
+
+    ds.write_dataset(
+        pa.Table.from_pandas(df, preserve_index=False),
+        Path(root),
+        format="parquet",
+        partitioning=PARTITIONING,
+        existing_data_behavior="delete_matching",
+        basename_template="part-{i}.parquet",
+        file_options=ds.ParquetFileFormat().make_write_options(compression="zstd"),
+        max_rows_per_group=ROW_GROUP_SIZE,
+        min_rows_per_group=0,
+        preserve_order=True,
+    )
+
+
+def read_lake(
+    root: Path,
+    tickers: list[str] | None = None,
+    start=None,
+    end=None,
+    columns: list[str] | None = None,
+) -> pd.DataFrame:
+    """
+    Lê só o recorte pedido: ticker e intervalo de datas viram filtros
+    no Parquet e `columns` limita as colunas lidas.
+    Sempre retorna ticker e date, ordenado por (ticker, date).
+    """
+    dataset = _dataset(root)
+    if dataset is None:
+        return pd.DataFrame(columns=["ticker", "date"] + [c for c in (columns or []) if c not in ("ticker", "date")])
+
+    if columns is not None:
+        columns = ["ticker", "date"] + [c for c in columns if c not in ("ticker", "date")]
+    else:
+        columns = [c for c in dataset.schema.names if c != "year"]
+
+    table = dataset.to_table(columns=columns, filter=_filter(tickers, start, end))
+    df = table.to_pandas()
+    return df.sort_values(["ticker", "date"]).reset_index(drop=True)
+
+
+def list_tickers(root: Path) -> list[str]:
+    # ticker sai do nome do diretório, sem abrir nenhum arquivo
+    return sorted(p.name.split("=", 1)[1] for p in Path(root).glob("ticker=*") if p.is_dir())
+
+
+def max_date(root: Path, ticker: str) -> pd.Timestamp | None:
+    # só abre a partição do ano mais recente do ticker
+    years = sorted(int(p.name.split("=", 1)[1]) for p in (Path(root) / f"ticker={ticker}").glob("year=*"))
+    if not years:
+        return None
+    dates = read_lake(root, tickers=[ticker], start=pd.Timestamp(years[-1], 1, 1), columns=["date"])["date"]
+    return dates.max() if len(dates) else None
+
+
+def upsert_lake(df: pd.DataFrame, root: Path) -> int:
+    """
+    Append + dedupe (ticker, date): reescreve só as partições (ticker, year)
+    tocadas por df. Retorna quantas linhas novas entraram.
+    """
+    if df.empty:
+        return 0
+
+    added = 0
+    parts = []
+    for ticker, g in df.groupby("ticker"):
+        start = pd.Timestamp(int(pd.to_datetime(g["date"]).dt.year.min()), 1, 1)
+        old = read_lake(root, tickers=[ticker], start=start)
+        merged = (
+            pd.concat([old, g], ignore_index=True)
+            .drop_duplicates(subset=["ticker", "date"], keep="last")
+        )
+        added += len(merged) - len(old)
+        parts.append(merged)
+
+    write_lake(pd.concat(parts, ignore_index=True), root)
+    return added
+
+
+def migrate_flat(root: Path):
+    # converte o layout antigo (1 arquivo <TICKER>.parquet por ticker) para o particionado
+    for file in sorted(Path(root).glob("*.parquet")):
+        write_lake(pd.read_parquet(file), root)
+        file.unlink()
+        print(f" Migrado: {file.name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Utilitários do lake (bronze/silver particionados)")
+    parser.add_argument("command", choices=["migrate"])
+    parser.add_argument("roots", nargs="*", default=[str(BRONZE_ROOT), str(SILVER_ROOT)])
+    args = parser.parse_args()
+
+    for root in args.roots:
+        migrate_flat(Path(root))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+from pathlib import Path
+import io
+import pandas as pd
+
+# DDL idempotente (CREATE ... IF NOT EXISTS + migrações guardadas); o initdb do
+# docker só roda com o volume vazio, então quem grava aplica antes de usar
+SCHEMA_SQL = Path(__file__).resolve().parent.parent / "db" / "init.sql" / "init.sql"
+
+
+def ensure_schema(engine):
+    # cursor cru: o script tem blocos DO $$ … $$ e casts ::regclass
+    with engine.begin() as conn:
+        with conn.connection.cursor() as cur:
+            cur.execute(SCHEMA_SQL.read_text(encoding="utf-8"))
+
+
+def copy_frame(cur, table: str, df: pd.DataFrame):
+    # COPY FROM STDIN em CSV: NaN/None viram campo vazio = NULL
+    buf = io.StringIO()
+    df.to_csv(buf, index=False, header=False, date_format="%Y-%m-%d")
+    buf.seek(0)
+    cur.copy_expert(f"COPY {table} ({', '.join(df.columns)}) FROM STDIN WITH (FORMAT csv)", buf)
+
+
+def copy_upsert(
+    cur,
+    table: str,
+    frames,
+    cols: list[str],
+    keys: tuple[str, ...] = ("ticker", "date"),
+    updates: str | None = None,
+) -> int:
+    """
+    Carrega `frames` (iterável de DataFrames) numa tabela temporária via COPY
+    e aplica INSERT ... ON CONFLICT (keys) DO UPDATE em `table`.
+    `updates` troca o SET padrão (col = EXCLUDED.col) por uma regra de merge.
+    Roda dentro da transação do cursor: quem lê a tabela nunca a vê vazia.
+    Chave repetida (no mesmo frame ou entre frames): vale a última linha.
+    Retorna o nº de linhas inseridas/atualizadas.
+    """
+    keys = list(keys)
+    stg = f"stg_{table}"
+    # _seq numera as linhas na ordem do COPY (frames podem ser um gerador de chunks)
+    cur.execute(f"CREATE TEMP TABLE {stg} (LIKE {table} INCLUDING DEFAULTS, _seq bigserial) ON COMMIT DROP")
+
+    for df in frames:
+        if len(df):
+            copy_frame(cur, stg, df[cols].drop_duplicates(keys, keep="last"))
+
+    col_list = ", ".join(cols)
+    key_list = ", ".join(keys)
+    if updates is None:
+        updates = ", ".join(f"{c} = EXCLUDED.{c}" for c in cols if c not in keys)
+
+    # DISTINCT ON: a mesma chave repetida no lote quebraria o ON CONFLICT;
+    # entre frames fica a de maior _seq, como drop_duplicates(keep="last")
+    cur.execute(
+        f"INSERT INTO {table} ({col_list}) "
+        f"SELECT DISTINCT ON ({key_list}) {col_list} FROM {stg} ORDER BY {key_list}, _seq DESC "
+        f"ON CONFLICT ({key_list}) DO UPDATE SET {updates}"
+    )
+    return cur.rowcount
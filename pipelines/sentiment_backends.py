@@ -0,0 +1,106 @@
+from pathlib import Path
+import os
+import re
+import numpy as np
+
+# backends de inferência do modelo de sentimento (CPU)
+BACKENDS = ("torch", "torch-int8", "onnx")
+
+ONNX_DIR = Path("data/cache/onnx")
+
+
+def default_threads(n: int | None = None) -> int:
+    # threads intra-op explícitas (padrão: SENTIMENT_THREADS ou nº de CPUs)
+    return n or int(os.getenv("SENTIMENT_THREADS", "0")) or os.cpu_count() or 1
+
+
+class TorchBackend:
+    """
+    Modelo em PyTorch fp32 ou, com quantize=True, com as camadas Linear
+    quantizadas dinamicamente para int8 (pesos int8, ativações quantizadas
+    em tempo de execução).
+    """
+
+    def __init__(self, model_name: str, threads: int | None = None, quantize: bool = False):
+        import torch
+        from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+        self.threads = default_threads(threads)
+        torch.set_num_threads(self.threads)
+
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        model = AutoModelForSequenceClassification.from_pretrained(model_name).eval()
+        if quantize:
+            model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        self.model = model
+        self.id2label = model.config.id2label
+        self._torch = torch
+
+    def logits(self, batch: dict) -> np.ndarray:
+        torch = self._torch
+        with torch.inference_mode():
+            inputs = {k: torch.from_numpy(np.asarray(batch[k])) for k in ("input_ids", "attention_mask")}
+            return self.model(**inputs).logits.numpy()
+
+
+class OnnxBackend:
+    """
+    Sessão do ONNX Runtime. Na primeira vez o modelo é exportado do PyTorch
+    para data/cache/onnx/<modelo>/model.onnx; depois só a sessão é carregada.
+    """
+
+    def __init__(self, model_name: str, threads: int | None = None):
+        import onnxruntime as ort
+        from transformers import AutoConfig, AutoTokenizer
+
+        self.threads = default_threads(threads)
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self.id2label = AutoConfig.from_pretrained(model_name).id2label
+
+        path = ONNX_DIR / re.sub(r"[^\w.-]+", "__", model_name) / "model.onnx"
+        if not path.exists():
+            export_onnx(model_name, path, self.tokenizer)
+
+        opts = ort.SessionOptions()
+        opts.intra_op_num_threads = self.threads
+        opts.inter_op_num_threads = 1
+        opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(str(path), opts, providers=["CPUExecutionProvider"])
+
+    def logits(self, batch: dict) -> np.ndarray:
+        feeds = {k: np.asarray(batch[k], dtype=np.int64) for k in ("input_ids", "attention_mask")}
+        return self.session.run(["logits"], feeds)[0]
+
+
+def export_onnx(model_name: str, path: Path, tokenizer):
+    import torch
+    from transformers import AutoModelForSequenceClassification
+
+    model = AutoModelForSequenceClassification.from_pretrained(model_name).eval()
+    sample = tokenizer(["exemplo de manchete", "outro"], padding=True, return_tensors="pt")
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    torch.onnx.export(
+        model,
+        (sample["input_ids"], sample["attention_mask"]),
+        str(path),
+        input_names=["input_ids", "attention_mask"],
+        output_names=["logits"],
+        dynamic_axes={
+            "input_ids": {0: "batch", 1: "seq"},
+            "attention_mask": {0: "batch", 1: "seq"},
+            "logits": {0: "batch"},
+        },
+        opset_version=17,
+        dynamo=False,
+    )
+
+
+def load_backend(name: str, model_name: str, threads: int | None = None):
+    if name == "torch":
+        return TorchBackend(model_name, threads)
+    if name == "torch-int8":
+        return TorchBackend(model_name, threads, quantize=True)
+    if name == "onnx":
+        return OnnxBackend(model_name, threads)
+    raise ValueError(f"Backend desconhecido: {name} (opções: {', '.join(BACKENDS)})")
@@ -0,0 +1,190 @@
+from pathlib import Path
+import hashlib
+import re
+import sqlite3
+import time
+import unicodedata
+
+CACHE_PATH = Path("data/cache/sentiment.sqlite")
+
+
+def normalize_title(title: str) -> str:
+    # mesma manchete com caixa/acentuação/espaços diferentes vira a mesma chave
+    t = unicodedata.normalize("NFKC", title).casefold()
+    return re.sub(r"\s+", " ", t).strip()
+
+
+def title_key(title: str) -> str:
+    return hashlib.sha1(normalize_title(title).encode("utf-8")).hexdigest()
+
+
+class SentimentCache:
+    """
+    Cache persistente (SQLite) de score por título, chaveado por
+    (modelo, hash do título normalizado). Trocar o modelo muda a chave,
+    então entradas antigas nunca são reaproveitadas.
+    """
+
+    def __init__(self, model_name: str, path: Path = CACHE_PATH):
+        self.model_name = model_name
+        self.hits = 0
+        self.misses = 0
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS title_scores ("
+            " model TEXT NOT NULL,"
+            " key TEXT NOT NULL,"
+            " score REAL NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " PRIMARY KEY (model, key))"
+        )
+        self.conn.commit()
+
+    def get_many(self, keys: list[str]) -> dict[str, float]:
+        found = {}
+        uniq = list(dict.fromkeys(keys))
+        # sqlite limita o nº de parâmetros por query
+        for i in range(0, len(uniq), 500):
+            chunk = uniq[i:i + 500]
+            rows = self.conn.execute(
+                f"SELECT key, score FROM title_scores WHERE model = ? AND key IN ({','.join('?' * len(chunk))})",
+                [self.model_name, *chunk],
+            ).fetchall()
+            found.update(rows)
+
+        hits = sum(k in found for k in keys)
+        self.hits += hits
+        self.misses += len(keys) - hits
+        return found
+
+    def put_many(self, items: dict[str, float]):
+        now = time.time()
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO title_scores (model, key, score, created_at) VALUES (?, ?, ?, ?)",
+            [(self.model_name, k, float(v), now) for k, v in items.items()],
+        )
+        self.conn.commit()
+
+    def evict(self, max_age_days: float | None = 30, max_rows: int | None = 200_000) -> int:
+        """
+        Remove entradas de outros modelos, mais velhas que `max_age_days`
+        e, se ainda passar de `max_rows`, as mais antigas.
+        Retorna quantas linhas saíram.
+        """
+        cur = self.conn.cursor()
+        removed = cur.execute("DELETE FROM title_scores WHERE model <> ?", [self.model_name]).rowcount
+
+        if max_age_days is not None:
+            cutoff = time.time() - max_age_days * 86400
+            removed += cur.execute("DELETE FROM title_scores WHERE created_at < ?", [cutoff]).rowcount
+
+        if max_rows is not None:
+            removed += cur.execute(
+                "DELETE FROM title_scores WHERE rowid IN ("
+                " SELECT rowid FROM title_scores ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                [max_rows],
+            ).rowcount
+
+        self.conn.commit()
+        return removed
+
+    def stats(self) -> str:
+        total = self.hits + self.misses
+        rate = self.hits / total if total else 0.0
+        return f"cache hits={self.hits} misses={self.misses} ({rate:.0%})"
+
+    def close(self):
+        self.conn.close()
+
+
+class FeedValidatorCache:
+    """
+    ETag / Last-Modified por URL de feed, para GET condicional na próxima
+    execução (feed sem mudanças custa só um 304).
+    """
+
+    def __init__(self, path: Path = CACHE_PATH):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS feed_validators ("
+            " url TEXT PRIMARY KEY,"
+            " etag TEXT,"
+            " modified TEXT,"
+            " updated_at REAL NOT NULL)"
+        )
+        self.conn.commit()
+
+    def get_many(self, urls: list[str]) -> dict[str, tuple[str | None, str | None]]:
+        found = {}
+        for i in range(0, len(urls), 500):
+            chunk = urls[i:i + 500]
+            rows = self.conn.execute(
+                f"SELECT url, etag, modified FROM feed_validators WHERE url IN ({','.join('?' * len(chunk))})",
+                chunk,
+            ).fetchall()
+            found.update({url: (etag, modified) for url, etag, modified in rows})
+        return found
+
+    def put(self, url: str, etag: str | None, modified: str | None):
+        if not etag and not modified:
+            return
+        self.conn.execute(
+            "INSERT OR REPLACE INTO feed_validators (url, etag, modified, updated_at) VALUES (?, ?, ?, ?)",
+            [url, etag, modified, time.time()],
+        )
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+
+class SeenTitles:
+    """
+    Títulos já agregados em sentiment_daily, por ticker. O merge incremental
+    soma cada título uma vez só, mesmo que o RSS o devolva de novo.
+    """
+
+    def __init__(self, path: Path = CACHE_PATH):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS seen_titles ("
+            " ticker TEXT NOT NULL,"
+            " key TEXT NOT NULL,"
+            " first_seen REAL NOT NULL,"
+            " PRIMARY KEY (ticker, key))"
+        )
+        self.conn.commit()
+
+    def unseen(self, ticker: str, titles: list[str]) -> list[bool]:
+        keys = [title_key(t) for t in titles]
+        seen = set()
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            rows = self.conn.execute(
+                f"SELECT key FROM seen_titles WHERE ticker = ? AND key IN ({','.join('?' * len(chunk))})",
+                [ticker, *chunk],
+            ).fetchall()
+            seen.update(k for (k,) in rows)
+        return [k not in seen for k in keys]
+
+    def mark(self, ticker: str, titles: list[str]):
+        now = time.time()
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO seen_titles (ticker, key, first_seen) VALUES (?, ?, ?)",
+            [(ticker, title_key(t), now) for t in titles],
+        )
+        self.conn.commit()
+
+    def evict(self, max_age_days: float = 90) -> int:
+        # bem mais longo que a janela do RSS, senão títulos antigos voltariam a contar
+        cutoff = time.time() - max_age_days * 86400
+        removed = self.conn.execute("DELETE FROM seen_titles WHERE first_seen < ?", [cutoff]).rowcount
+        self.conn.commit()
+        return removed
+
+    def close(self):
+        self.conn.close()